@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# bench/docker_events.py
+#
+# Replays recorded Docker events through lim_update_cache.apply_container_event
+# against a fake client and checks the cache after each one: create/start/
+# rename/die/destroy, exec and health events that must not touch the cache,
+# non-container events, events for containers already gone, the pre-1.22
+# "status"-only event format and compose paths from labels. Then times the
+# same mapping over --events generated events. Exits non-zero when a check
+# fails. No Docker daemon or docker SDK is needed.
+#
+#   python3 bench/docker_events.py --events 20000
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lim_update_cache
+
+WEB_ID = "a" * 64
+DB_ID = "b" * 64
+NGINX_IMAGE = "sha256:" + "1" * 64
+POSTGRES_IMAGE = "sha256:" + "2" * 64
+COMPOSE_LABELS = {
+    "com.docker.compose.project": "shop",
+    "com.docker.compose.project.working_dir": "/srv/shop",
+}
+
+
+class FakeAPI:
+    """The two /containers/json and /images/json calls the event mapping makes."""
+
+    def __init__(self):
+        self.summaries = {}
+        self.tags = {NGINX_IMAGE: "nginx:1.25"}
+        self.image_calls = 0
+        self.container_calls = 0
+
+    def containers(self, all=False, filters=None):
+        self.container_calls += 1
+        wanted = (filters or {}).get("id")
+        return [dict(s) for i, s in self.summaries.items() if wanted in (None, i)]
+
+    def images(self):
+        self.image_calls += 1
+        return [{"Id": i, "RepoTags": [tag]} for i, tag in self.tags.items()]
+
+
+class FakeClient:
+    def __init__(self):
+        self.api = FakeAPI()
+
+
+def summary(full_id, name, image_id, state, labels=None):
+    return {
+        "Id": full_id,
+        "Names": [f"/{name}"],
+        "ImageID": image_id,
+        "State": state,
+        "Labels": labels or {},
+    }
+
+
+def event(action, full_id, kind="container", **attributes):
+    """An event as client.events(decode=True) yields it since API 1.22."""
+    return {
+        "status": action,
+        "id": full_id,
+        "Type": kind,
+        "Action": action,
+        "Actor": {"ID": full_id, "Attributes": attributes},
+        "scope": "local",
+        "time": 1700000000,
+        "timeNano": 1700000000000000000,
+    }
+
+
+def replay(check):
+    """Docker state change, recorded event, expected result and resulting cache entry."""
+    client = FakeClient()
+    api = client.api
+    cache = {"containers": {}, "timestamp": 0, "error": None}
+    image_tags = {}
+
+    def apply(name, recorded, expect_changed, expect_entry, short_id=WEB_ID[:12]):
+        changed = lim_update_cache.apply_container_event(client, cache, recorded, image_tags)
+        entry = cache["containers"].get(short_id)
+        ok = changed == expect_changed and (
+            entry is None if expect_entry is None
+            else entry is not None and all(entry.get(k) == v for k, v in expect_entry.items())
+        )
+        check(name, ok, f"changed={changed} entry={entry}")
+
+    api.summaries[WEB_ID] = summary(WEB_ID, "web", NGINX_IMAGE, "created", COMPOSE_LABELS)
+    apply(
+        "create adds the container",
+        event("create", WEB_ID, image="nginx:1.25", name="web"),
+        True,
+        {"id": WEB_ID, "name": "web", "image": "nginx:1.25", "status": "created",
+         "compose_path": "/srv/shop"},
+    )
+    check("image tags fetched once for a new image", api.image_calls == 1, api.image_calls)
+
+    api.summaries[WEB_ID]["State"] = "running"
+    apply("start updates the status", event("start", WEB_ID), True, {"status": "running"})
+    check("known image not fetched again", api.image_calls == 1, api.image_calls)
+
+    calls = api.container_calls
+    apply("exec event ignored", event("exec_start: sh -c ls", WEB_ID), False, {"status": "running"})
+    apply("health event ignored", event("health_status: healthy", WEB_ID), False, {"status": "running"})
+    apply("network event ignored", event("connect", WEB_ID, kind="network"), False, {"status": "running"})
+    check("ignored events make no API calls", api.container_calls == calls, api.container_calls - calls)
+
+    api.summaries[WEB_ID]["Names"] = ["/web-1"]
+    apply("rename updates the name", event("rename", WEB_ID, oldName="/web", name="web-1"),
+          True, {"name": "web-1"})
+
+    api.summaries[WEB_ID]["State"] = "exited"
+    apply("die updates the status", event("die", WEB_ID, exitCode="0"), True, {"status": "exited"})
+
+    del api.summaries[WEB_ID]
+    apply("destroy removes the container", event("destroy", WEB_ID), True, None)
+    apply("destroy of an unknown container", event("destroy", WEB_ID), False, None)
+    apply("start of a removed container", event("start", WEB_ID), False, None)
+
+    api.summaries[DB_ID] = summary(DB_ID, "db", POSTGRES_IMAGE, "running")
+    api.tags[POSTGRES_IMAGE] = "postgres:16"
+    apply(
+        "old-style event with status only",
+        {"status": "start", "id": DB_ID, "from": "postgres:16", "time": 1700000000},
+        True,
+        {"name": "db", "image": "postgres:16", "status": "running", "compose_path": None},
+        short_id=DB_ID[:12],
+    )
+    check("cache holds only the live container", list(cache["containers"]) == [DB_ID[:12]],
+          list(cache["containers"]))
+
+
+def time_events(count):
+    client = FakeClient()
+    cache = {"containers": {}}
+    image_tags = dict(client.api.tags)
+    ids = [f"{i:064x}" for i in range(100)]
+    for i, full_id in enumerate(ids):
+        client.api.summaries[full_id] = summary(full_id, f"svc-{i}", NGINX_IMAGE, "running")
+    actions = ("start", "exec_start: sh", "die", "health_status: healthy", "restart")
+    recorded = [event(actions[i % len(actions)], ids[i % len(ids)]) for i in range(count)]
+    start = time.perf_counter()
+    for item in recorded:
+        lim_update_cache.apply_container_event(client, cache, item, image_tags)
+    return (time.perf_counter() - start) * 1e6 / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lim docker event mapping check")
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(name, ok, detail=""):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f": {detail}" if not ok else ""))
+        if not ok:
+            failures.append(name)
+
+    replay(check)
+    print(f"{args.events} events: {time_events(args.events):.2f} us per event (fake client)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
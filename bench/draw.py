@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# bench/draw.py
+#
+# Times the per-frame draw cost of the CPU panel (history graph and per-core
+# bars) on a many-core host: generates --cores per-core samples and a full
+# history, draws frames inside a pseudo-terminal, and reports the median time
+# per frame together with the number of addstr calls that reached curses. Frames
+# are drawn into a bare curses window and, as in the monitor, into a
+# render.RenderWindow whose changed rows are flushed after each frame. Nothing
+# is refreshed to the terminal, so only the Python-side drawing is measured.
+#
+#   python3 bench/draw.py --cores 256 --frames 200
+
+import argparse
+import json
+import os
+import pty
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class CountingWindow:
+    """Passes calls through to a curses window, counting addstr/addch calls."""
+
+    def __init__(self, win):
+        self.win = win
+        self.calls = 0
+
+    def addstr(self, *args):
+        self.calls += 1
+        return self.win.addstr(*args)
+
+    def addch(self, *args):
+        self.calls += 1
+        return self.win.addch(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.win, name)
+
+
+def make_frames(count, cores, rng):
+    history = [rng.uniform(0, 100) for _ in range(512)]
+    frames = []
+    for _ in range(count):
+        history = history[1:] + [rng.uniform(0, 100)]
+        per_core = [rng.choice((0.0, rng.uniform(0, 100))) for _ in range(cores)]
+        frames.append(
+            {
+                "total": history[-1],
+                "cores_str": str(cores),
+                "freq_str": "3.10GHz",
+                "history": tuple(history),
+                "per_core": per_core,
+                "per_core_error": None,
+            }
+        )
+    return frames
+
+
+def run(stdscr, args):
+    import curses
+
+    import cpu_block
+    import render
+
+    curses.start_color()
+    curses.use_default_colors()
+    for pair in range(1, 20):
+        curses.init_pair(pair, pair % 8, -1)
+    gradient = [12, 13, 14, 15, 17]
+    key_attr = curses.color_pair(1) | curses.A_BOLD
+    value_attr = curses.color_pair(2)
+
+    frames = make_frames(args.frames, args.cores, random.Random(args.seed))
+    results = {}
+    for mode in ("window", "render"):
+        counter = CountingWindow(curses.newwin(args.rows, args.cols, 0, 0))
+        win = render.RenderWindow(counter) if mode == "render" else counter
+        samples = []
+        for data in frames:
+            start = time.perf_counter()
+            cpu_block.draw_cpu_block_content(
+                win, key_attr, value_attr, gradient, 1.0, data=data
+            )
+            if mode == "render":
+                win.flush()
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        results[mode] = {
+            "median_ms": samples[len(samples) // 2] * 1000,
+            "best_ms": samples[0] * 1000,
+            "calls": counter.calls / len(frames),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lim CPU panel draw cost")
+    parser.add_argument("--cores", type=int, default=256)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--cols", type=int, default=120)
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    read_fd, write_fd = os.pipe()
+    pid, fd = pty.fork()
+    if pid == 0:
+        import curses
+        import struct
+        import termios
+        import fcntl
+
+        os.close(read_fd)
+        os.environ.setdefault("TERM", "xterm-256color")
+        fcntl.ioctl(0, termios.TIOCSWINSZ, struct.pack("HHHH", args.rows, args.cols, 0, 0))
+        result = curses.wrapper(run, args)
+        os.write(write_fd, json.dumps(result).encode())
+        os._exit(0)
+    os.close(write_fd)
+    result = b""
+    while True:
+        try:
+            os.read(fd, 65536)  # Drain the terminal so the child never blocks
+        except OSError:
+            break
+    while chunk := os.read(read_fd, 65536):
+        result += chunk
+    os.waitpid(pid, 0)
+    if not result:
+        print("benchmark child failed", file=sys.stderr)
+        sys.exit(1)
+    for mode, result in json.loads(result).items():
+        print(
+            f"cpu panel, {args.cores} cores, {mode:<6}: median={result['median_ms']:6.2f} ms"
+            f"  best={result['best_ms']:6.2f} ms  curses calls/frame={result['calls']:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
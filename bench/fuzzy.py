@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# bench/fuzzy.py
+#
+# Times fuzzy bookmark and container lookups over generated data: the full
+# cold path of `lim tp <partial>` and of the suggestions `lim go <partial>`
+# prints (index built per call, as without the daemon) and the warm path with
+# a prebuilt index (daemon, navigator). Near-miss queries against long,
+# repetitive names catch regex backtracking. Exits non-zero when the slowest
+# query is over --budget-ms.
+#
+#   python3 bench/fuzzy.py --bookmarks 5000 --containers 5000
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lim_bookmarks
+import lim_lookup
+
+WORDS = (
+    "api web db redis cache worker proxy nginx auth billing search front admin "
+    "metrics logs queue mail static gateway backup media report sync"
+).split()
+
+NEAR_MISS_NAME = "-".join(["test"] * 8)
+NEAR_MISS_NAMES = 5
+
+
+def random_name(rng):
+    parts = rng.sample(WORDS, rng.randint(1, 3))
+    return "-".join(parts) + f"-{rng.randint(1, 999)}"
+
+
+def make_bookmarks(count, rng):
+    now = time.time()
+    bookmarks = {}
+    while len(bookmarks) < count:
+        name = random_name(rng)
+        bookmarks[name] = lim_bookmarks.make_entry(
+            f"/srv/{name}", rng.randint(0, 50), now - rng.randint(0, 30 * 86400)
+        )
+    return bookmarks
+
+
+def make_containers(count, rng):
+    containers = []
+    for _ in range(count):
+        full_id = "".join(rng.choice("0123456789abcdef") for _ in range(64))
+        containers.append({"id": full_id, "short_id": full_id[:12], "name": random_name(rng)})
+    return containers
+
+
+def time_ms(func, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lim fuzzy lookup timing")
+    parser.add_argument("--bookmarks", type=int, default=5000)
+    parser.add_argument("--containers", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    bookmarks = make_bookmarks(args.bookmarks, rng)
+    containers = make_containers(args.containers, rng)
+    # Long repetitive names that the "testtestx"-style queries nearly match
+    for i, container in enumerate(containers[:NEAR_MISS_NAMES]):
+        container["name"] = NEAR_MISS_NAME + f"-{i}"
+        bookmarks[container["name"]] = lim_bookmarks.make_entry(f"/srv/{container['name']}")
+    index = lim_lookup.build_container_index(containers)
+    bookmark_index = lim_lookup.build_fuzzy_index(bookmarks)
+    container_index = lim_lookup.build_fuzzy_index(index["names"])
+    queries = ["api", "wrk", "ngx-ca", "bllsrch", "mtrc42", "zzz", "testtestx", "tttttttttttttx"] + [
+        "".join(rng.sample(string.ascii_lowercase, 3)) for _ in range(4)
+    ]
+
+    worst = 0.0
+    print(f"{'query':<14} {'tp cold':>9} {'tp warm':>9} {'go cold':>9} {'go warm':>9}  (ms)")
+    for query in queries:
+        row = [
+            time_ms(lambda: lim_lookup.rank_bookmarks(query, bookmarks, limit=1), args.rounds),
+            time_ms(
+                lambda: lim_lookup.rank_bookmarks(query, bookmarks, 1, bookmark_index),
+                args.rounds,
+            ),
+            time_ms(lambda: lim_lookup.suggest_containers(query, index), args.rounds),
+            time_ms(
+                lambda: lim_lookup.suggest_containers(query, index, container_index),
+                args.rounds,
+            ),
+        ]
+        worst = max(worst, *row)
+        print(f"{query:<14} " + " ".join(f"{value:9.2f}" for value in row))
+    print(f"slowest: {worst:.2f} ms  budget={args.budget_ms:.0f} ms")
+    sys.exit(0 if worst <= args.budget_ms else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# bench/import_budget.py
+#
+# Guards the import cost of the short `lim` subcommands: runs them under
+# `python -X importtime`, sums the self time of every module imported after
+# interpreter startup, and exits non-zero when the total is over --budget-ms
+# or when one of the heavy modules (rich, docker, curses, psutil) is pulled in.
+#
+#   python3 bench/import_budget.py --budget-ms 30
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIM = os.path.join(ROOT, "lim")
+HEAVY_MODULES = ("rich", "docker", "curses", "psutil")
+COMMANDS = (["tp", "bench"], ["go", "bench"])
+
+
+def write_fixtures(home):
+    config_dir = os.path.join(home, ".config", "lim")
+    os.makedirs(config_dir)
+    with open(os.path.join(config_dir, "bookmarks.json"), "w") as f:
+        json.dump({"bench": home}, f)
+    container = {"id": "b" * 64, "short_id": "b" * 12, "name": "bench", "working_dir": home}
+    with open(os.path.join(config_dir, "docker_cache.json"), "w") as f:
+        json.dump({"containers": {container["short_id"]: container}}, f)
+
+
+def parse_importtime(stderr):
+    """Returns {top-level package: self time in us} for imports after site."""
+    totals, after_site = {}, False
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[12:].split("|"))
+        if not after_site:
+            after_site = name == "site"
+            continue
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+    return totals
+
+
+def measure(lim, command, home):
+    env = dict(os.environ, HOME=home, LIM_SOCKET=os.path.join(home, "none.sock"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", lim, *command],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lim subcommand import budget")
+    parser.add_argument("--lim", default=LIM, help="launcher to measure")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as home:
+        write_fixtures(home)
+        for command in COMMANDS:
+            runs = [measure(args.lim, command, home) for _ in range(args.runs)]
+            best = min(runs, key=lambda totals: sum(totals.values()))
+            total_ms = sum(best.values()) / 1000
+            heavy = sorted(set().union(*runs) & set(HEAVY_MODULES))
+            top = sorted(best.items(), key=lambda item: -item[1])[:5]
+            print(
+                f"lim {' '.join(command):<10} imports={total_ms:6.1f} ms"
+                f"  budget={args.budget_ms:.0f} ms  top: "
+                + ", ".join(f"{name} {us / 1000:.1f}" for name, us in top)
+            )
+            if heavy:
+                print(f"  heavy modules imported: {', '.join(heavy)}", file=sys.stderr)
+            failed = failed or heavy or total_ms > args.budget_ms
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
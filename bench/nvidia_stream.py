@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# bench/nvidia_stream.py
+#
+# Checks gpu_block.NvidiaSmiStream against a fake nvidia-smi put first on
+# PATH, and times a poll() against a one-shot parse_nv_smi(). The fake prints
+# --gpus CSV lines every -lms milliseconds and exits after --lines samples,
+# which covers the first sample, updates, the child dying (its values must be
+# dropped at once) and the restart. Like nvidia-smi, it takes the interval only
+# as `-lms N` or `--loop-ms=N` and exits with an error on any other argument.
+# Exits non-zero when a check fails.
+#
+#   python3 bench/nvidia_stream.py --gpus 2 --lines 10
+
+import argparse
+import os
+import stat
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gpu_block
+
+FAKE_NVIDIA_SMI = """#!{python}
+import sys, time
+args = sys.argv[1:]
+loop = None
+while args:
+    arg = args.pop(0)
+    if arg == "-lms" and args and args[0].isdigit():
+        loop = int(args.pop(0))
+    elif arg.startswith("--loop-ms=") and arg[10:].isdigit():
+        loop = int(arg[10:])
+    elif not arg.startswith(("--query-gpu=", "--format=")):
+        print(f"Invalid combination of input arguments: {{arg}}", file=sys.stderr)
+        sys.exit(2)
+interval = loop / 1000 if loop else 0
+for sample in range({lines} if loop else 1):
+    for gpu in range({gpus}):
+        print(f"{{gpu}}, Fake GPU {{gpu}}, {{sample % 100}}, 50, {{1000 + sample}}, 40960", flush=True)
+    time.sleep(interval)
+"""
+
+
+def install_fake(directory, gpus, lines):
+    path = os.path.join(directory, "nvidia-smi")
+    with open(path, "w") as f:
+        f.write(FAKE_NVIDIA_SMI.format(python=sys.executable, gpus=gpus, lines=lines))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    os.environ["PATH"] = directory + os.pathsep + os.environ.get("PATH", "")
+
+
+def poll_until(stream, predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while True:
+        gpus = stream.poll()
+        if predicate(gpus) or time.monotonic() > deadline:
+            return gpus
+        time.sleep(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lim nvidia-smi stream check")
+    parser.add_argument("--gpus", type=int, default=2)
+    parser.add_argument("--lines", type=int, default=10)
+    parser.add_argument("--interval-ms", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(name, ok, detail=""):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f": {detail}" if detail and not ok else ""))
+        if not ok:
+            failures.append(name)
+
+    with tempfile.TemporaryDirectory() as directory:
+        install_fake(directory, args.gpus, args.lines)
+        # Restarts are counted from the last start: leave the child time to exit first
+        run_time = args.lines * args.interval_ms / 1000
+        gpu_block.NVSMI_RESTART_INTERVAL = run_time + 1.0
+        stream = gpu_block.NvidiaSmiStream(args.interval_ms)
+        try:
+            gpus = stream.poll()
+            check("first sample", len(gpus) == args.gpus, gpus)
+            check("sorted by index", [g["id"] for g in gpus] == list(range(args.gpus)))
+            first_used = gpus[0]["mem_used"] if gpus else None
+            gpus = poll_until(stream, lambda g: g and g[0]["mem_used"] != first_used, 2.0)
+            check("values update", bool(gpus) and gpus[0]["mem_used"] != first_used)
+
+            gpus = poll_until(stream, lambda g: not g, run_time + 0.5)
+            check("dropped when the child exits", gpus == [] and stream.proc is None, gpus)
+            check("stays empty until restart", stream.poll() == [])
+
+            time.sleep(max(0.0, stream.started_at + gpu_block.NVSMI_RESTART_INTERVAL - time.monotonic()))
+            gpus = stream.poll()
+            check("restarted", len(gpus) == args.gpus and stream.proc is not None, gpus)
+
+            samples = []
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                stream.poll()
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            stream_ms = samples[len(samples) // 2] * 1000
+            start = time.perf_counter()
+            oneshot = gpu_block.parse_nv_smi()
+            oneshot_ms = (time.perf_counter() - start) * 1000
+            check("one-shot parse", len(oneshot) == args.gpus, oneshot)
+        finally:
+            stream.stop()
+    print(f"poll median={stream_ms:.3f} ms  one-shot nvidia-smi={oneshot_ms:.1f} ms")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# bench/process_engines.py
+#
+# Compares the psutil and procfs collection engines of process_block.
+# Forks idle children until the host has --procs processes, then times
+# collect_processes() for each engine. Before that, checks the procfs engine
+# reports the same username as psutil for every live process, and the real
+# UID rather than the owner of /proc/[pid] for a non-dumpable process (a fake
+# /proc entry owned by root whose status has a different real UID). Exits
+# non-zero when a check fails.
+#
+#   python3 bench/process_engines.py --procs 10000 --rounds 5
+
+import argparse
+import os
+import signal
+import sys
+import tempfile
+import time
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import process_block
+
+
+def spawn_children(count):
+    pids = []
+    for _ in range(count):
+        try:
+            pid = os.fork()
+        except OSError as e:
+            print(f"fork failed after {len(pids)} children: {e}", file=sys.stderr)
+            break
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.pause()
+            os._exit(0)
+        pids.append(pid)
+    return pids
+
+
+def reap_children(pids):
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in pids:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+
+
+def check_usernames(check):
+    mismatched = []
+    for pid in psutil.pids():
+        try:
+            expected = psutil.Process(pid).username()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, KeyError):
+            continue
+        got = process_block._read_procfs_username(pid)
+        if got is not None and got != expected:
+            mismatched.append((pid, got, expected))
+    check("procfs username matches psutil", not mismatched, mismatched[:5])
+
+    # A setuid program or sshd after privilege drop: /proc/[pid] stays owned by
+    # root while the real UID in status is the user's.
+    real_uid = 65534
+    with tempfile.TemporaryDirectory() as proc_root:
+        os.mkdir(os.path.join(proc_root, "4242"))
+        with open(os.path.join(proc_root, "4242", "status"), "w") as f:
+            f.write(f"Name:\tpasswd\nUmask:\t0022\nState:\tS (sleeping)\n"
+                    f"Uid:\t{real_uid}\t0\t0\t0\nGid:\t100\t100\t100\t100\n")
+        saved, process_block.PROC_ROOT = process_block.PROC_ROOT, proc_root
+        try:
+            got = process_block._read_procfs_username(4242)
+        finally:
+            process_block.PROC_ROOT = saved
+    expected = process_block._username_for_uid(real_uid)
+    check("non-dumpable process reports its real UID", got == expected, f"{got} != {expected}")
+
+
+def time_engine(engine, rounds):
+    process_block.collect_processes(engine)
+    samples = []
+    count = 0
+    for _ in range(rounds):
+        time.sleep(0.2)
+        start = time.perf_counter()
+        count = len(process_block.collect_processes(engine))
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return count, samples[len(samples) // 2], samples[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="psutil vs procfs process scan")
+    parser.add_argument("--procs", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(name, ok, detail=""):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f": {detail}" if not ok else ""))
+        if not ok:
+            failures.append(name)
+
+    check_usernames(check)
+    existing = sum(1 for name in os.listdir("/proc") if name.isdigit())
+    children = spawn_children(max(0, args.procs - existing))
+    try:
+        for engine in ("psutil", "procfs"):
+            count, median, best = time_engine(engine, args.rounds)
+            print(
+                f"{engine:<7} rows={count:<6} median={median * 1000:8.1f} ms"
+                f"  best={best * 1000:8.1f} ms"
+            )
+    finally:
+        reap_children(children)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
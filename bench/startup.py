@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# bench/startup.py
+#
+# Measures how long `lim` takes to put its first frame on screen: runs the
+# launcher in a pseudo-terminal and times the gap between exec and the first
+# output containing the CPU panel title. Each run is paired with a bare
+# interpreter printing the same marker, and the budget applies to lim's own
+# share, the difference of the medians: interpreter start-up (site-packages
+# .pth hooks alone can take 50 ms on some hosts) is not lim's to spend. Exits
+# non-zero when that share is over --budget-ms; --absolute checks the raw
+# median instead. The tree's modules are byte-compiled first, as an
+# installed lim would have them, so a stale .pyc is not timed as start-up.
+#
+#   python3 bench/startup.py --runs 10 --budget-ms 120
+
+import argparse
+import compileall
+import os
+import pty
+import select
+import signal
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIM = os.path.join(ROOT, "lim")
+FIRST_FRAME_MARKER = b"CPU"
+BARE_INTERPRETER = ["-c", "import time; print('CPU', flush=True); time.sleep(5)"]
+
+
+def time_first_frame(argv, cols, rows, timeout):
+    start = time.perf_counter()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.environ.setdefault("TERM", "xterm-256color")
+        os.environ["COLUMNS"], os.environ["LINES"] = str(cols), str(rows)
+        os.execv(sys.executable, [sys.executable] + argv)
+    import fcntl
+    import struct
+    import termios
+
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+    output = b""
+    elapsed = None
+    deadline = start + timeout
+    try:
+        while time.perf_counter() < deadline:
+            ready, _, _ = select.select([fd], [], [], 0.01)
+            if not ready:
+                continue
+            try:
+                output += os.read(fd, 65536)
+            except OSError:
+                break
+            if FIRST_FRAME_MARKER in output:
+                elapsed = time.perf_counter() - start
+                break
+    finally:
+        try:
+            os.write(fd, b"q")
+            time.sleep(0.2)
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+        os.waitpid(pid, 0)
+        os.close(fd)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lim time-to-first-frame")
+    parser.add_argument("--lim", default=LIM, help="launcher to time")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=120.0)
+    parser.add_argument(
+        "--absolute", action="store_true", help="apply the budget to the raw median"
+    )
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--cols", type=int, default=160)
+    parser.add_argument("--rows", type=int, default=48)
+    args = parser.parse_args()
+
+    compileall.compile_dir(ROOT, maxlevels=0, quiet=1)
+    samples, bare_samples = [], []
+    for _ in range(args.runs):
+        bare = time_first_frame(BARE_INTERPRETER, args.cols, args.rows, args.timeout)
+        elapsed = time_first_frame([args.lim], args.cols, args.rows, args.timeout)
+        if elapsed is None or bare is None:
+            print(f"no frame within {args.timeout:.1f} s", file=sys.stderr)
+            sys.exit(2)
+        samples.append(elapsed)
+        bare_samples.append(bare)
+    samples.sort()
+    bare_samples.sort()
+    median = samples[len(samples) // 2]
+    bare_median = bare_samples[len(bare_samples) // 2]
+    checked = median if args.absolute else median - bare_median
+    print(
+        f"first frame: median={median * 1000:7.1f} ms  best={samples[0] * 1000:7.1f} ms"
+        f"  worst={samples[-1] * 1000:7.1f} ms  bare python={bare_median * 1000:6.1f} ms"
+    )
+    print(
+        f"{'total' if args.absolute else 'lim own'}: {checked * 1000:7.1f} ms"
+        f"  budget={args.budget_ms:.0f} ms"
+    )
+    sys.exit(0 if checked * 1000 <= args.budget_ms else 1)
+
+
+if __name__ == "__main__":
+    main()
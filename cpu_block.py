@@ -5,7 +5,14 @@ import psutil
 import time
 from collections import deque
 from math import floor, ceil
-from utils import addstr_clipped, draw_box, draw_bar, format_bytes
+from utils import (
+    addstr_clipped,
+    addstr_runs,
+    bar_runs,
+    cells_to_runs,
+    draw_box,
+    format_bytes,
+)
 
 H_GRAPH_HEIGHT = 6
 CPU_HISTORY_LEN = 60
@@ -13,8 +20,17 @@ GRAPH_CHARS = [" ", " ", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
 SEGMENTS_PER_CHAR_CELL = 15
 
 
+PROC_STAT_PATH = "/proc/stat"
+# Per-core breakdown tuple layout in collect_cpu_data()["per_core_times"].
+PER_CORE_FIELDS = ("user", "system", "iowait", "steal")
+
+
 cpu_percent_history = deque(maxlen=CPU_HISTORY_LEN)
+# Width of the graph last drawn: the collector resizes the history to it on
+# its own thread, so the history holds exactly one sample per graph column
+cpu_history_width = CPU_HISTORY_LEN
 previous_cpu_times = None
+previous_proc_stat = None
 
 
 def calculate_cpu_percent(current_times, previous_times):
@@ -75,8 +91,141 @@ def calculate_cpu_percent(current_times, previous_times):
     return total_load_percent, calculated_times
 
 
-def draw_cpu_block_content(win, key_attr, value_attr, gradient_colors, update_interval):
-    global previous_cpu_times, cpu_percent_history
+def read_proc_stat(path=PROC_STAT_PATH):
+    # One read of /proc/stat -> {"cpu": [ticks...], "cpu0": [...], ...}.
+    # Columns: user nice system idle iowait irq softirq steal guest guest_nice.
+    with open(path, "rb") as f:
+        data = f.read()
+    counters = {}
+    for line in data.split(b"\n"):
+        if not line.startswith(b"cpu"):
+            if counters:
+                break
+            continue
+        parts = line.split()
+        counters[parts[0].decode()] = list(map(int, parts[1:9]))
+    return counters
+
+
+def proc_stat_breakdown(current, previous):
+    # Percentages of one cpu line between two samples. guest/guest_nice are
+    # already counted in user/nice, so only the first 8 columns are summed.
+    deltas = [max(0, c - p) for c, p in zip(current, previous)]
+    deltas += [0] * (8 - len(deltas))
+    user, nice, system, idle, iowait, irq, softirq, steal = deltas[:8]
+    total = user + nice + system + idle + iowait + irq + softirq + steal
+    if total <= 0:
+        return 0.0, 0.0, 0.0, 0.0, 0.0, 100.0
+    scale = 100.0 / total
+    return (
+        (total - idle) * scale,
+        (user + nice) * scale,
+        (system + irq + softirq) * scale,
+        iowait * scale,
+        steal * scale,
+        idle * scale,
+    )
+
+
+def _collect_proc_stat():
+    # Total and per-core usage from a single /proc/stat read, as deltas
+    # against the previous sample. Never sleeps.
+    global previous_proc_stat
+    counters = read_proc_stat()
+    previous = previous_proc_stat
+    previous_proc_stat = counters
+    if previous is None or "cpu" not in previous or "cpu" not in counters:
+        cpu_total = 0.0
+        times = {"user": 0.0, "system": 0.0, "idle": 100.0, "iowait": 0.0, "steal": 0.0}
+    else:
+        load, user, system, iowait, steal, idle = proc_stat_breakdown(
+            counters["cpu"], previous["cpu"]
+        )
+        cpu_total = max(0.0, min(100.0, load))
+        times = {
+            "user": user,
+            "system": system,
+            "idle": idle,
+            "iowait": iowait,
+            "steal": steal,
+        }
+    per_core = []
+    per_core_times = []
+    index = 0
+    while True:
+        name = f"cpu{index}"
+        current = counters.get(name)
+        if current is None:
+            break
+        prev = previous.get(name) if previous else None
+        if prev is None:
+            per_core.append(0.0)
+            per_core_times.append((0.0, 0.0, 0.0, 0.0))
+        else:
+            load, user, system, iowait, steal, idle = proc_stat_breakdown(current, prev)
+            per_core.append(max(0.0, min(100.0, load - iowait)))
+            per_core_times.append((user, system, iowait, steal))
+        index += 1
+    return cpu_total, times, tuple(per_core), tuple(per_core_times)
+
+
+def _collect_psutil_cpu():
+    global previous_cpu_times
+    current_times = psutil.cpu_times()
+    cpu_total, cpu_times_dict = calculate_cpu_percent(current_times, previous_cpu_times)
+    previous_cpu_times = current_times
+    per_core = tuple(psutil.cpu_percent(interval=None, percpu=True))
+    return cpu_total, cpu_times_dict, per_core, None
+
+
+def collect_cpu_data():
+    global cpu_percent_history
+    per_core_error = None
+    if cpu_percent_history.maxlen != cpu_history_width:
+        cpu_percent_history = deque(cpu_percent_history, maxlen=cpu_history_width)
+    try:
+        cpu_total, cpu_times_dict, per_core, per_core_times = _collect_proc_stat()
+    except (OSError, ValueError, IndexError):
+        per_core = None
+        per_core_times = None
+        try:
+            cpu_total, cpu_times_dict, per_core, per_core_times = _collect_psutil_cpu()
+        except Exception as e_core:
+            cpu_total = 0.0
+            cpu_times_dict = {"user": 0.0, "system": 0.0, "idle": 100.0, "iowait": 0.0}
+            per_core_error = str(e_core)
+    cpu_percent_history.append(cpu_total)
+    cores_str = "N/A"
+    freq_str = "N/A"
+    try:
+        l = psutil.cpu_count(logical=True)
+        p = psutil.cpu_count(logical=False)
+        cores_str = f"{l}" + (f"({p}p)" if p and l != p else "")
+    except:
+        pass
+    try:
+        f = psutil.cpu_freq()
+        if f and f.current:
+            c = int(f.current)
+            freq_str = f"{c}MHz" if c < 1500 else f"{c / 1000.0:.2f}GHz"
+    except:
+        pass
+    return {
+        "total": cpu_total,
+        "times": cpu_times_dict,
+        "cores_str": cores_str,
+        "freq_str": freq_str,
+        "history": tuple(cpu_percent_history),
+        "per_core": per_core,
+        "per_core_times": per_core_times,
+        "per_core_error": per_core_error,
+    }
+
+
+def draw_cpu_block_content(
+    win, key_attr, value_attr, gradient_colors, update_interval, data=None
+):
+    global cpu_history_width
     h, w = win.getmaxyx()
     draw_box(win, "CPU", key_attr)
     current_row = 1
@@ -85,29 +234,13 @@ def draw_cpu_block_content(win, key_attr, value_attr, gradient_colors, update_in
     num_gradient_steps = len(gradient_colors)
 
     try:
-        current_times = psutil.cpu_times()
-        cpu_total, cpu_times_dict = calculate_cpu_percent(
-            current_times, previous_cpu_times
-        )
-        previous_cpu_times = current_times
-        cpu_percent_history.append(cpu_total)
+        if data is None:
+            data = collect_cpu_data()
+        cpu_total = data["total"]
         cpu_total_str = f"{cpu_total:.1f}%".rjust(6)
         load_label = "Load:"
-        cores_str = "N/A"
-        freq_str = "N/A"
-        try:
-            l = psutil.cpu_count(logical=True)
-            p = psutil.cpu_count(logical=False)
-            cores_str = f"{l}" + (f"({p}p)" if p and l != p else "")
-        except:
-            pass
-        try:
-            f = psutil.cpu_freq()
-            if f and f.current:
-                c = int(f.current)
-                freq_str = f"{c}MHz" if c < 1500 else f"{c / 1000.0:.2f}GHz"
-        except:
-            pass
+        cores_str = data["cores_str"]
+        freq_str = data["freq_str"]
         info_line = (
             f"{load_label} {cpu_total_str}  Cores: {cores_str}  Freq: {freq_str}"
         )
@@ -127,12 +260,7 @@ def draw_cpu_block_content(win, key_attr, value_attr, gradient_colors, update_in
         graph_start_row = current_row
         graph_height = H_GRAPH_HEIGHT
         graph_width = max(1, w - 2)
-        if len(cpu_percent_history) > graph_width:
-            t = list(cpu_percent_history)
-            cpu_percent_history.clear()
-            cpu_percent_history.extend(t[-graph_width:])
-        if cpu_percent_history.maxlen != graph_width:
-            cpu_percent_history = deque(cpu_percent_history, maxlen=graph_width)
+        cpu_history_width = graph_width
 
         if graph_start_row + graph_height < h - 2:
             total_segments_possible = graph_height * SEGMENTS_PER_CHAR_CELL
@@ -140,16 +268,14 @@ def draw_cpu_block_content(win, key_attr, value_attr, gradient_colors, update_in
                 100.0 / total_segments_possible if total_segments_possible > 0 else 1.0
             )
 
-            for r in range(graph_height):
-                addstr_clipped(
-                    win, graph_start_row + r, 1, bg_char * graph_width, bg_attr
-                )
-            history_list = list(cpu_percent_history)
+            # The graph is built cell by cell, then each row goes out as runs
+            graph_chars = [[bg_char] * graph_width for _ in range(graph_height)]
+            graph_attrs = [[bg_attr] * graph_width for _ in range(graph_height)]
+            history_list = list(data["history"][-graph_width:])
             num_chars = len(GRAPH_CHARS)
             segments_per_char = num_chars - 1
 
             for col_idx, percent in enumerate(history_list):
-                graph_x = 1 + col_idx
                 if percent <= 0:
                     continue
                 filled_segments_total = ceil(total_segments_possible * percent / 100.0)
@@ -158,14 +284,13 @@ def draw_cpu_block_content(win, key_attr, value_attr, gradient_colors, update_in
                 )
 
                 if 0 < percent < low_percent_threshold_dot * 1.5:
-                    graph_y = graph_start_row + graph_height - 1
-                    dot_attr = curses.color_pair(gradient_colors[0])
-                    addstr_clipped(win, graph_y, graph_x, ".", dot_attr)
+                    graph_chars[-1][col_idx] = "."
+                    graph_attrs[-1][col_idx] = curses.color_pair(gradient_colors[0])
                 elif filled_segments_total >= 1:
                     if filled_segments_total == 0:
                         filled_segments_total = 1
                     for row_idx in range(graph_height):
-                        graph_y = graph_start_row + graph_height - 1 - row_idx
+                        graph_y = graph_height - 1 - row_idx
                         segments_for_full_rows_below = row_idx * SEGMENTS_PER_CHAR_CELL
                         segments_remaining = (
                             filled_segments_total - segments_for_full_rows_below
@@ -197,9 +322,15 @@ def draw_cpu_block_content(win, key_attr, value_attr, gradient_colors, update_in
                         segment_fill_attr = curses.color_pair(color_pair_id)
                         if use_underline:
                             segment_fill_attr |= curses.A_UNDERLINE
-                        addstr_clipped(
-                            win, graph_y, graph_x, graph_char, segment_fill_attr
-                        )
+                        graph_chars[graph_y][col_idx] = graph_char
+                        graph_attrs[graph_y][col_idx] = segment_fill_attr
+            for r in range(graph_height):
+                addstr_runs(
+                    win,
+                    graph_start_row + r,
+                    1,
+                    cells_to_runs(graph_chars[r], graph_attrs[r]),
+                )
             current_row += graph_height
         else:
             current_row = h - 2
@@ -208,37 +339,35 @@ def draw_cpu_block_content(win, key_attr, value_attr, gradient_colors, update_in
             addstr_clipped(win, current_row, 1, "Per Core:", key_attr)
             current_row += 1
             per_core_error = None
+            if data["per_core_error"]:
+                per_core_error = f"Per Core Err: {data['per_core_error'][:w - 20]}"
             try:
                 simple_bar_colors = {"high": 10, "med": 9, "low": 8}
-                cpu_percents = psutil.cpu_percent(interval=0.1, percpu=True)
+                cpu_percents = data["per_core"]
                 if cpu_percents:
                     num_cores = len(cpu_percents)
                     core_bar_width = 5
-                    core_info_width = 3 + core_bar_width + 9
+                    # "<label> [#####] 100.0%" plus a space; labels are padded to
+                    # the widest core number so the columns stay aligned
+                    label_width = len(f"{num_cores - 1}:")
+                    core_info_width = label_width + core_bar_width + 10
                     cores_per_line = max(1, (w - 2) // core_info_width)
                     start_y_cores = current_row
                     max_core_lines = h - start_y_cores - 1
                     cores_to_show = min(num_cores, cores_per_line * max_core_lines)
+                    # One list of (text, attr) runs per line, drawn with one call per run
+                    core_lines = []
                     for i in range(cores_to_show):
                         perc = cpu_percents[i]
                         if perc is None:
                             perc = 0.0
                         li = i // cores_per_line
                         ci = i % cores_per_line
-                        cy = start_y_cores + li
-                        cx = 1 + ci * core_info_width
-                        cl = f"{i}:"
-                        addstr_clipped(win, cy, cx, cl, key_attr)
-                        draw_bar(
-                            win,
-                            cy,
-                            cx + len(cl) + 1,
-                            core_bar_width,
-                            perc,
-                            w,
-                            simple_bar_colors,
-                            show_percent=False,
-                        )
+                        if ci == 0:
+                            core_lines.append([])
+                        cl = f"{i}:".ljust(label_width)
+                        if ci > 0:
+                            cl = " " + cl
                         ps = f"{perc:.1f}%".rjust(6)
                         pa = value_attr
                         cpu_med_threshold = 60.0
@@ -253,10 +382,17 @@ def draw_cpu_block_content(win, key_attr, value_attr, gradient_colors, update_in
                                 curses.color_pair(simple_bar_colors["med"])
                                 | curses.A_BOLD
                             )
-                        addstr_clipped(
-                            win, cy, cx + len(cl) + 1 + core_bar_width + 2, ps, pa
-                        )
-                else:
+                        bar = bar_runs(core_bar_width, perc, simple_bar_colors)
+                        core_lines[li] += [
+                            (cl, key_attr),
+                            (" " + bar[0][0], bar[0][1]),
+                            bar[1],
+                            bar[2],
+                            (ps, pa),
+                        ]
+                    for li, runs in enumerate(core_lines):
+                        addstr_runs(win, start_y_cores + li, 1, runs, w - 1)
+                elif not per_core_error:
                     per_core_error = "Per Core data N/A"
             except Exception as e_core:
                 per_core_error = f"Per Core Err: {str(e_core)[:w - 20]}"
@@ -1,9 +1,13 @@
 # gpu_block.py
 
+import atexit
 import curses
+import select
 import subprocess
 import os
 import glob
+import time
+import profiler
 from utils import addstr_clipped, draw_box, draw_bar, format_bytes
 
 GPU_TEMP_THRESHOLD_HIGH = 85
@@ -11,47 +15,185 @@ GPU_TEMP_THRESHOLD_MED = 70
 GPU_UTIL_THRESHOLD_HIGH = 85
 GPU_UTIL_THRESHOLD_MED = 60
 
+NVSMI_QUERY_FIELDS = (
+    "index,name,utilization.gpu,temperature.gpu,memory.used,memory.total"
+)
+NVSMI_STREAM_INTERVAL_MS = 1000
+NVSMI_FIRST_SAMPLE_TIMEOUT = 1.5
+NVSMI_RESTART_INTERVAL = 30
+GPU_INVENTORY_REFRESH_INTERVAL = 60
+SYSFS_GPU_VENDORS = {
+    "0x10de": "NVIDIA",
+    "0x1002": "AMD",
+    "0x1022": "AMD",
+    "0x8086": "Intel",
+}
+
+gpu_inventory = None
+gpu_inventory_time = 0.0
+nvsmi_stream = None
+
+
+def parse_nv_smi_line(line):
+    p = line.split(",")
+    if len(p) != 6:
+        return None
+    try:
+        mem_used = float(p[4].strip())
+        mem_total = float(p[5].strip())
+        return {
+            "id": int(p[0].strip()),
+            "name": p[1].strip(),
+            "vendor": "NVIDIA",
+            "util": float(p[2].strip()),
+            "temp": float(p[3].strip()),
+            "mem_used": mem_used,
+            "mem_total": mem_total,
+            "mem_perc": mem_used / mem_total * 100 if mem_total > 0 else 0.0,
+            "source": "nvidia-smi",
+        }
+    except ValueError:
+        return None
+
 
 def parse_nv_smi():
     gpus = []
     try:
         cmd = [
             "nvidia-smi",
-            "--query-gpu=index,name,utilization.gpu,temperature.gpu,memory.used,memory.total",
+            f"--query-gpu={NVSMI_QUERY_FIELDS}",
             "--format=csv,noheader,nounits",
         ]
-        res = subprocess.run(
-            cmd, capture_output=True, text=True, check=False, timeout=1.5
-        )
+        with profiler.timed("nvidia-smi"):
+            res = subprocess.run(
+                cmd, capture_output=True, text=True, check=False, timeout=1.5
+            )
         if res.returncode == 0 and res.stdout:
             for line in res.stdout.strip().splitlines():
-                p = line.split(",")
-                if len(p) == 6:
-                    try:
-                        gpus.append(
-                            {
-                                "id": int(p[0].strip()),
-                                "name": p[1].strip(),
-                                "vendor": "NVIDIA",
-                                "util": float(p[2].strip()),
-                                "temp": float(p[3].strip()),
-                                "mem_used": float(p[4].strip()),
-                                "mem_total": float(p[5].strip()),
-                                "mem_perc": (
-                                    float(p[4].strip()) / float(p[5].strip()) * 100
-                                )
-                                if float(p[5].strip()) > 0
-                                else 0.0,
-                                "source": "nvidia-smi",
-                            }
-                        )
-                    except:
-                        continue
+                gpu = parse_nv_smi_line(line)
+                if gpu:
+                    gpus.append(gpu)
     except:
         pass
     return gpus
 
 
+class NvidiaSmiStream:
+    # One long-lived `nvidia-smi --query-gpu ... -lms N` child. Its stdout is
+    # non-blocking and drained on every poll(); the newest line per GPU index
+    # wins. A dead child is restarted at most every NVSMI_RESTART_INTERVAL;
+    # its last values are dropped when it exits, not shown as current.
+    def __init__(self, interval_ms=NVSMI_STREAM_INTERVAL_MS):
+        self.interval_ms = interval_ms
+        self.proc = None
+        self.buffer = b""
+        self.latest = {}
+        self.started_at = 0.0
+        self.has_sample = False
+
+    def start(self):
+        self.stop()
+        self.started_at = time.monotonic()
+        self.buffer = b""
+        self.has_sample = False
+        cmd = [
+            "nvidia-smi",
+            f"--query-gpu={NVSMI_QUERY_FIELDS}",
+            "--format=csv,noheader,nounits",
+            "-lms",
+            str(self.interval_ms),
+        ]
+        try:
+            self.proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            self.proc = None
+            return False
+        os.set_blocking(self.proc.stdout.fileno(), False)
+        return True
+
+    def stop(self):
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            if proc.poll() is None:
+                proc.terminate()
+                proc.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        except OSError:
+            pass
+        try:
+            proc.stdout.close()
+        except OSError:
+            pass
+
+    def _drain(self):
+        fd = self.proc.stdout.fileno()
+        eof = False
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                eof = True
+                break
+            if not chunk:
+                eof = True
+                break
+            self.buffer += chunk
+        *lines, self.buffer = self.buffer.split(b"\n")
+        for line in lines:
+            gpu = parse_nv_smi_line(line.decode(errors="replace"))
+            if gpu:
+                self.latest[gpu["id"]] = gpu
+                self.has_sample = True
+        return eof
+
+    def poll(self):
+        if self.proc is None:
+            if time.monotonic() - self.started_at < NVSMI_RESTART_INTERVAL:
+                return []
+            if not self.start():
+                return []
+        # Only the first sample after a (re)start waits, and on the sampler
+        # thread rather than the UI.
+        deadline = time.monotonic() + NVSMI_FIRST_SAMPLE_TIMEOUT
+        while True:
+            if self._drain():
+                self.stop()
+                self.latest = {}
+                break
+            remaining = deadline - time.monotonic()
+            if self.has_sample or remaining <= 0:
+                break
+            try:
+                select.select([self.proc.stdout], [], [], remaining)
+            except (OSError, ValueError):
+                break
+        return [self.latest[idx] for idx in sorted(self.latest)]
+
+
+def get_nvidia_stream():
+    global nvsmi_stream
+    if nvsmi_stream is None:
+        nvsmi_stream = NvidiaSmiStream()
+        atexit.register(stop_nvidia_stream)
+    return nvsmi_stream
+
+
+def stop_nvidia_stream():
+    if nvsmi_stream is not None:
+        nvsmi_stream.stop()
+
+
 def find_hwmon_temp_input(hwmon_path):
     try:
         tfs = glob.glob(os.path.join(hwmon_path, "temp*_input"))
@@ -72,10 +214,12 @@ def find_hwmon_temp_input(hwmon_path):
         return None
 
 
-def parse_sys_info():
+def parse_sys_info(cards=None):
     gpus = []
     try:
-        for cp in glob.glob("/sys/class/drm/card[0-9]*"):
+        if cards is None:
+            cards = glob.glob("/sys/class/drm/card[0-9]*")
+        for cp in cards:
             gi = {
                 "source": "sysfs",
                 "vendor": "?",
@@ -134,55 +278,78 @@ def parse_sys_info():
     return gpus
 
 
-def get_gpu_count():
-    count = 0
-    nv_gpus = []
+def detect_gpu_inventory():
+    nv_count = 0
     try:
         cmd = ["nvidia-smi", "-L"]
-        res = subprocess.run(
-            cmd, capture_output=True, text=True, check=False, timeout=0.5
-        )
+        with profiler.timed("nvidia-smi -L"):
+            res = subprocess.run(
+                cmd, capture_output=True, text=True, check=False, timeout=0.5
+            )
         if res.returncode == 0 and res.stdout:
-            nv_gpus = res.stdout.strip().splitlines()
-            count += len(nv_gpus)
+            nv_count = len(res.stdout.strip().splitlines())
     except:
         pass
 
+    count = nv_count
+    cards = []
     try:
         processed_vendors_in_sys = set()
-        if nv_gpus:
+        if nv_count:
             processed_vendors_in_sys.add("0x10de")
 
-        for card_path in glob.glob("/sys/class/drm/card[0-9]*/device/vendor"):
+        for cp in sorted(glob.glob("/sys/class/drm/card[0-9]*")):
             try:
-                with open(card_path, "r") as f:
+                with open(os.path.join(cp, "device/vendor"), "r") as f:
                     vendor_id = f.read().strip().lower()
-                if vendor_id in ["0x1002", "0x1022", "0x8086"] or (
-                    vendor_id == "0x10de" and vendor_id not in processed_vendors_in_sys
-                ):
-                    count += 1
-                    processed_vendors_in_sys.add(vendor_id)
             except:
                 continue
+            if vendor_id not in SYSFS_GPU_VENDORS:
+                continue
+            cards.append(cp)
+            if vendor_id in ["0x1002", "0x1022", "0x8086"] or (
+                vendor_id == "0x10de" and vendor_id not in processed_vendors_in_sys
+            ):
+                count += 1
+                processed_vendors_in_sys.add(vendor_id)
     except:
         pass
-    return count
+    return {"nvidia": nv_count, "cards": tuple(cards), "count": count}
 
 
-def draw_gpu_block_content(
-    win, key_attr, value_attr, bar_colors, temp_colors, util_colors
-):
-    h, w = win.getmaxyx()
-    draw_box(win, "GPU Info", key_attr)
-    current_row = 1
+def get_gpu_inventory(force=False):
+    # GPUs are (practically) never hot-plugged, so the `nvidia-smi -L` and
+    # sysfs scan only run every GPU_INVENTORY_REFRESH_INTERVAL seconds.
+    global gpu_inventory, gpu_inventory_time
+    now = time.monotonic()
+    if (
+        force
+        or gpu_inventory is None
+        or now - gpu_inventory_time >= GPU_INVENTORY_REFRESH_INTERVAL
+    ):
+        gpu_inventory = detect_gpu_inventory()
+        gpu_inventory_time = now
+    return gpu_inventory
+
+
+def get_gpu_count():
+    return get_gpu_inventory()["count"]
+
+
+def collect_gpu_data():
     all_gpus = []
     error_msg = None
-
+    inventory = get_gpu_inventory()
     try:
-        nv_gpus = parse_nv_smi()
+        nv_gpus = []
+        if inventory["nvidia"]:
+            with profiler.timed("nvidia-smi stream"):
+                nv_gpus = get_nvidia_stream().poll()
+        elif nvsmi_stream is not None:
+            stop_nvidia_stream()
         all_gpus.extend(nv_gpus)
         nv_names = {gpu.get("name") for gpu in nv_gpus}
-        sys_gpus = parse_sys_info()
+        sys_gpus = parse_sys_info(inventory["cards"])
         for gpu in sys_gpus:
             is_duplicate = False
             if gpu["vendor"] == "NVIDIA" and gpu["name"] in nv_names:
@@ -190,7 +357,20 @@ def draw_gpu_block_content(
             if not is_duplicate:
                 all_gpus.append(gpu)
     except Exception as e:
-        error_msg = f"GPU Read Err: {str(e)[:w - 15]}"
+        error_msg = f"GPU Read Err: {e}"
+    return {"gpus": all_gpus, "count": inventory["count"], "error": error_msg}
+
+
+def draw_gpu_block_content(
+    win, key_attr, value_attr, bar_colors, temp_colors, util_colors, data=None
+):
+    h, w = win.getmaxyx()
+    draw_box(win, "GPU Info", key_attr)
+    current_row = 1
+    if data is None:
+        data = collect_gpu_data()
+    all_gpus = list(data["gpus"])
+    error_msg = data["error"][: w - 2] if data["error"] else None
 
     if error_msg:
         if current_row < h - 1:
@@ -267,6 +447,6 @@ def draw_gpu_block_content(
                     )
                 upx = 1 + len(u_lbl) + 1 + (u_bar_w + 2 if u_bar_w > 0 else 0)
                 addstr_clipped(win, current_row, upx, u_str, u_attr)
-            addstr_clipped(win, w - len(m_str) - 1, m_str, m_attr)
+            addstr_clipped(win, current_row, w - len(m_str) - 1, m_str, m_attr)
             current_row += 1
             gpus_shown += 1
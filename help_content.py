@@ -11,6 +11,7 @@ HELP_MONITOR_TEXT = [
     " <c3>[q]uit</>         : Exit the monitor",
     " <c3>[h]elp</>         : Show this help screen",
     " <c3>[r]efresh</>      : Force refresh Docker cache",
+    " <c3>[t]imings</>      : Toggle the frame-time overlay (p50/p95/max, ms)",
     "",
     "<b5>====== Modes (Toggle Keys) ======</>",
     " <c1>[d]ocker</>        : Toggle Docker mode (show only container processes)",
@@ -41,8 +42,9 @@ HELP_MONITOR_TEXT = [
     " <c4>Killer Mode</> : Show signal confirmation ([S]igTERM, [K]ill -9)",
     "",
     "<b5>======== Other ========</>",
-    "  Cache Files    : /tmp/py_monitor_prev_rss.*.tsv",
+    "  Cache Files    : /tmp/py_monitor_rss_history.*.bin",
     "                 : /tmp/docker_name_cache.tsv",
+    "                 : ~/.config/lim/dmidecode_cache.json",
     "  Log File       : /tmp/py_monitor_errors.log",
 ]
 
@@ -53,13 +55,13 @@ HELP_CLI_TEXT = [
     "",
     "<b5>====== Команды Docker ======</>",
     " <c3>lim go <контейнер></>",
-    "  Создает скрипты для перехода в директорию контейнера.",
+    "  Переходит в директорию контейнера (нужен eval \"$(lim init bash)\").",
     " <c3>lim inspect <контейнер></>",
     "  Показывает 'docker inspect'.",
     "",
     "<b5>====== Закладки (Телепорт) ======</>",
     " <c3>lim tp <имя_закладки></>",
-    "  Создает скрипты для перехода по закладке.",
+    "  Переходит по закладке; lim back - обратно.",
     " <c3>lim tp list</>",
     "  Показывает все закладки.",
     "",
@@ -72,10 +74,12 @@ HELP_CLI_DETAILED = [
     "  - Запускает главный TUI-монитор системы.",
     "lim tui (или list, nav, l)",
     "  - Запускает навигационный TUI для Docker и закладок.",
+    "lim --batch [-d сек] [-n N] [-o файл] [--fields ...] [--top N]",
+    "  - Пишет замеры монитора в формате JSON Lines без интерфейса.",
     "",
     "--- Docker ---",
     "lim go <имя_или_id>",
-    "  - Создает временные скрипты (l.sh, b.sh) для перехода в директорию docker-compose контейнера.",
+    "  - Переходит в директорию docker-compose контейнера в текущем shell.",
     "lim inspect <имя_или_id>",
     "  - Показывает результат 'docker inspect' для контейнера.",
     "lim updatecache",
@@ -83,11 +87,19 @@ HELP_CLI_DETAILED = [
     "",
     "--- Закладки (Телепорт) ---",
     "lim tp <имя>",
-    "  - Создает скрипты (l.sh, b.sh) для перехода в директорию, сохраненную в закладке.",
+    "  - Переходит в директорию, сохраненную в закладке. Можно указать часть имени:",
+    "    выбирается лучшее нечеткое совпадение, частые и недавние закладки - выше.",
     "lim tp list",
     "  - Показывает таблицу со всеми созданными закладками.",
     "lim tp add <имя> [путь]",
     "  - Добавляет новую закладку. Если путь не указан, используется текущая директория.",
     "lim tp del <имя>",
     "  - Удаляет закладку с указанным именем.",
+    "",
+    "--- Интеграция в shell ---",
+    "eval \"$(lim init bash)\"",
+    "  - Добавьте в ~/.bashrc (или ~/.zshrc с zsh): lim go, lim tp и навигатор меняют",
+    "    директорию текущего shell без временных скриптов и вложенных shell.",
+    "lim back",
+    "  - Возвращает в предыдущую директорию (стек pushd/popd).",
 ]
\ No newline at end of file
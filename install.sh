@@ -13,6 +13,8 @@ COMPLETION_SCRIPT="lim-completion.bash"
 DEST_COMPLETION_DIR="/etc/bash_completion.d"
 CRON_FILE="/etc/cron.d/lim_cache_updater"
 CRON_SCHEDULE="*/5 * * * *"
+WATCHER_SERVICE="lim-cache-watcher.service"
+WATCHER_UNIT_FILE="/etc/systemd/system/$WATCHER_SERVICE"
 
 # --- Функции ---
 install_dependencies() {
@@ -95,6 +97,31 @@ install_cache_updater() {
     fi
 }
 
+install_cache_watcher() {
+    if [ -f "$SCRIPT_DIR/$CACHE_UPDATER_SCRIPT" ] && command -v systemctl &> /dev/null; then
+        echo "--- Настройка службы $WATCHER_SERVICE (обновление кэша по событиям Docker) ---"
+        sudo tee "$WATCHER_UNIT_FILE" > /dev/null <<EOF
+[Unit]
+Description=LIMbo Docker cache updater (docker events)
+After=docker.service
+Wants=docker.service
+
+[Service]
+ExecStart=/usr/bin/python3 $DEST_CACHE_UPDATER --watch
+Restart=always
+RestartSec=5
+
+[Install]
+WantedBy=multi-user.target
+EOF
+        sudo systemctl daemon-reload
+        sudo systemctl enable --now "$WATCHER_SERVICE" > /dev/null 2>&1 || \
+            echo "!!! Не удалось запустить $WATCHER_SERVICE, кэш будет обновляться только cron-задачей."
+    else
+        echo "--- systemd not found, Docker events watcher not configured ---"
+    fi
+}
+
 install_completion() {
     if [ -f "$SCRIPT_DIR/$COMPLETION_SCRIPT" ]; then
         echo "--- Installing bash completion ---"
@@ -117,11 +144,14 @@ install_dependencies
 install_docker
 install_files
 install_cache_updater
+install_cache_watcher
 install_completion
 
 echo ""
 echo "--- Installation finished! ---"
 echo "You can run the monitor with: lim"
+echo "To let 'lim go', 'lim tp' and 'lim tui' change your shell's directory, add to ~/.bashrc:"
+echo '    eval "$(lim init bash)"'
 echo "If you were just added to the 'docker' group, remember to logout/login or run 'newgrp docker'."
 
 exit 0
\ No newline at end of file
@@ -1,51 +1,112 @@
 #!/bin/bash
 
+# Готовые списки слов: ~/.config/lim/completion_containers.txt пишет
+# lim_update_cache.py вместе с кэшем, completion_bookmarks.txt - lim tp при
+# каждом изменении закладок. Файл читается встроенным mapfile, а слова
+# отбираются сравнением строк - без единого дочернего процесса.
+_lim_add_matches() {
+    local cur="$1" word
+    shift
+    for word in "$@"; do
+        [[ "$word" == "$cur"* ]] && COMPREPLY+=("$word")
+    done
+    return 0
+}
+
+# Возвращает 1, если файла нет (старая установка) - тогда используются запасные источники.
+_lim_complete_from_file() {
+    local file="$HOME/.config/lim/completion_$1.txt" words
+    [ -r "$file" ] || return 1
+    mapfile -t words < "$file"
+    _lim_add_matches "$2" "${words[@]}"
+}
+
+# Слова для дополнения из сервиса `lim daemon` через его unix-сокет.
+# Возвращает 1, если сервис не запущен, nc недоступен или сокет (либо его
+# директория) принадлежит другому пользователю.
+_lim_lookup_words() {
+    local sock="${LIM_SOCKET:-${XDG_RUNTIME_DIR:-/tmp}/lim-${UID}/lookup.sock}"
+    [ -S "$sock" ] && [ -O "$sock" ] && [ -O "${sock%/*}" ] || return 1
+    command -v nc &> /dev/null || return 1
+    local reply
+    mapfile -t reply < <(printf 'WORDS %s\n' "$1" | nc -U -w 1 "$sock" 2>/dev/null)
+    [ "${reply[0]}" = "OK" ] || return 1
+    printf '%s\n' "${reply[@]:1}"
+}
+
+# Запасной путь без файла слов: сервис, jq по кэшу, docker ps
+_lim_fallback_containers() {
+    local containers
+    local cache_file="$HOME/.config/lim/docker_cache.json"
+    containers=$(_lim_lookup_words containers)
+    if [ -z "$containers" ] && [ -f "$cache_file" ] && command -v jq &> /dev/null; then
+        containers=$(jq -r '.containers[].name,.containers[].short_id' "$cache_file" 2>/dev/null)
+    fi
+    if [ -z "$containers" ]; then
+        containers=$(docker ps --format "{{.Names}} {{.ID}}" 2>/dev/null)
+    fi
+    COMPREPLY+=($(compgen -W "${containers}" -- "$1"))
+}
+
+_lim_fallback_bookmarks() {
+    local bookmark_names
+    local bookmarks_file="$HOME/.config/lim/bookmarks.json"
+    bookmark_names=$(_lim_lookup_words bookmarks)
+    if [ -z "$bookmark_names" ] && [ -f "$bookmarks_file" ] && command -v jq &> /dev/null; then
+        bookmark_names=$(jq -r 'keys | .[]' "$bookmarks_file" 2>/dev/null)
+    fi
+    COMPREPLY+=($(compgen -W "${bookmark_names}" -- "$1"))
+}
+
 _lim_completion() {
     local cur prev opts
     COMPREPLY=()
     cur="${COMP_WORDS[COMP_CWORD]}"
     prev="${COMP_WORDS[COMP_CWORD-1]}"
     
-    opts="tui list l nav go inspect i updatecache tp help"
+    opts=(tui list l nav go inspect i updatecache daemon init back tp help --batch)
 
     if [ ${COMP_CWORD} -eq 1 ]; then
-        COMPREPLY=($(compgen -W "${opts}" -- "${cur}"))
+        _lim_add_matches "${cur}" "${opts[@]}"
         return 0
     fi
 
     local command="${COMP_WORDS[1]}"
     case "${command}" in
         inspect|i|go)
-            local containers
-            local cache_file="$HOME/.config/lim/docker_cache.json"
-            if [ -f "$cache_file" ] && command -v jq &> /dev/null; then
-                containers=$(jq -r '.containers[].name,.containers[].short_id' "$cache_file" 2>/dev/null)
-            fi
-            if [ -z "$containers" ]; then
-                containers=$(docker ps --format "{{.Names}} {{.ID}}" 2>/dev/null)
-            fi
-            COMPREPLY=($(compgen -W "${containers}" -- "${cur}"))
+            _lim_complete_from_file containers "${cur}" || _lim_fallback_containers "${cur}"
             ;;
 
-        tp)
-            # Автодополнение для sub-команд tp
-            local tp_opts="add del list"
-            local bookmarks_file="$HOME/.config/lim/bookmarks.json"
+        init)
+            [ ${COMP_CWORD} -eq 2 ] && _lim_add_matches "${cur}" bash zsh
+            ;;
 
+        --batch|-b)
+            # lim --batch [--interval S] [--count N] [--output FILE] ...
+            case "${prev}" in
+                --sort)
+                    _lim_add_matches "${cur}" cpu rss mem pid vms name
+                    ;;
+                --output|-o)
+                    # Имена файлов дополняет сам bash
+                    compopt -o default 2>/dev/null
+                    ;;
+                --interval|-d|--count|-n|--top|--fields)
+                    ;;
+                *)
+                    _lim_add_matches "${cur}" --interval --count --output --fields --top --sort
+                    ;;
+            esac
+            ;;
+
+        tp)
+            # Автодополнение для sub-команд tp и имен закладок
             if [ ${COMP_CWORD} -eq 2 ]; then
-                local bookmark_names
-                if [ -f "$bookmarks_file" ] && command -v jq &> /dev/null; then
-                    bookmark_names=$(jq -r 'keys | .[]' "$bookmarks_file" 2>/dev/null)
-                fi
-                COMPREPLY=($(compgen -W "${tp_opts} ${bookmark_names}" -- "${cur}"))
-            
+                _lim_add_matches "${cur}" add del list
+                _lim_complete_from_file bookmarks "${cur}" || _lim_fallback_bookmarks "${cur}"
             elif [ ${COMP_CWORD} -eq 3 ] && [[ "${COMP_WORDS[2]}" == "del" ]]; then
                 # Автодополнение для `lim tp del <bookmark>`
-                local bookmark_names
-                if [ -f "$bookmarks_file" ] && command -v jq &> /dev/null; then
-                    bookmark_names=$(jq -r 'keys | .[]' "$bookmarks_file" 2>/dev/null)
-                fi
-                COMPREPLY=($(compgen -W "${bookmark_names}" -- "${cur}"))
+                _lim_complete_from_file bookmarks "${cur}" || _lim_fallback_bookmarks "${cur}"
             fi
             ;;
         *)
@@ -54,4 +115,4 @@ _lim_completion() {
     return 0
 }
 
-complete -F _lim_completion lim
\ No newline at end of file
+complete -F _lim_completion lim
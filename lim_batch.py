@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Headless sampling for `lim --batch`.
+
+Runs the monitor's collectors (lim_monitor.build_collectors) through a
+sampler.Sampler without starting its thread or curses, and writes one compact
+JSON object per sample, JSON Lines, to stdout or appended to a file:
+
+    {"ts": 1792229781.3, "seq": 1, "cpu": {...}, "memory": {...}, "gpu": {...},
+     "misc": {...}, "system": {...}, "process_count": 412, "processes": [...]}
+
+Named tuples from psutil become objects. Drawing-only data (the CPU history,
+the dmidecode RAM module list) is left out. `fields` keeps only the given
+dotted paths, e.g. "cpu.total,memory.mem.percent,processes.pid"; a path into
+"processes" applies to every row. Collectors whose section is not selected are
+not run. Processes are sorted like the monitor's list and cut to `top` rows.
+The first sample is taken one interval after start, so CPU percentages cover a
+full interval instead of reading 0.
+"""
+
+import json
+import os
+import sys
+import time
+
+import lim_monitor
+import process_block
+import sampler
+
+SECTIONS = ("cpu", "memory", "gpu", "misc", "system", "processes")
+DRAWING_ONLY_FIELDS = {"cpu": ("history",), "memory": ("modules",)}
+PROCESS_DROP_FIELDS = ("memory_info",)
+SORT_KEYS = ("cpu", "rss", "mem", "pid", "vms", "name")
+RECORD_KEYS = SECTIONS + ("ts", "seq", "process_count", "errors")
+
+
+def to_jsonable(value):
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, tuple) and hasattr(value, "_asdict"):
+        return {k: to_jsonable(v) for k, v in value._asdict().items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def parse_fields(fields):
+    """Splits "a.b,c" into [["a", "b"], ["c"]]; None or "" selects everything."""
+    if not fields:
+        return None
+    return [path.strip().split(".") for path in fields.split(",") if path.strip()]
+
+
+def select_path(value, path):
+    if not path:
+        return value
+    if isinstance(value, list):
+        return [select_path(item, path) for item in value]
+    if isinstance(value, dict) and path[0] in value:
+        return {path[0]: select_path(value[path[0]], path[1:])}
+    return None
+
+
+def merge_selected(target, selected):
+    for key, value in selected.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge_selected(target[key], value)
+        elif isinstance(value, list) and isinstance(target.get(key), list):
+            for target_item, item in zip(target[key], value):
+                if isinstance(target_item, dict) and isinstance(item, dict):
+                    merge_selected(target_item, item)
+        else:
+            target[key] = value
+
+
+def select_fields(record, paths):
+    if paths is None:
+        return record
+    selected = {"ts": record["ts"], "seq": record["seq"]}
+    for path in paths:
+        part = select_path(record, path)
+        if part:
+            merge_selected(selected, part)
+    return selected
+
+
+def build_record(snapshot, seq, top, sort_key):
+    record = {"ts": round(snapshot.timestamp, 3), "seq": seq}
+    for name in SECTIONS:
+        value = snapshot.data.get(name)
+        if value is None:
+            continue
+        if name == "processes":
+            rows = process_block.sort_processes(value["rows"], sort_key, top)
+            if top is not None:
+                rows = rows[:top]
+            record["process_count"] = len(value["rows"])
+            value = [
+                {k: v for k, v in row.items() if k not in PROCESS_DROP_FIELDS}
+                for row in rows
+            ]
+        elif name in DRAWING_ONLY_FIELDS:
+            value = {
+                k: v for k, v in value.items() if k not in DRAWING_ONLY_FIELDS[name]
+            }
+        record[name] = to_jsonable(value)
+    if snapshot.errors:
+        record["errors"] = dict(snapshot.errors)
+    return record
+
+
+def run(interval=1.0, count=0, output=None, fields=None, top=None, sort_key="cpu"):
+    """Samples every `interval` seconds, `count` times (0: until interrupted). Returns an exit code."""
+    paths = parse_fields(fields)
+    sections = set(SECTIONS) if paths is None else {path[0] for path in paths}
+    unknown = sections - set(RECORD_KEYS)
+    if unknown:
+        print(
+            f"Unknown fields: {', '.join(sorted(unknown))} (known: {', '.join(RECORD_KEYS)})",
+            file=sys.stderr,
+        )
+        return 2
+    if "process_count" in sections:
+        sections.add("processes")
+    collect_state = {"docker_only": False, "gpu_visible": "gpu" in sections}
+    collectors = [
+        (name, collect)
+        for name, collect in lim_monitor.build_collectors(collect_state)
+        if name in sections
+    ]
+    data_sampler = sampler.Sampler(collectors, interval)
+    try:
+        out = open(output, "a", encoding="utf-8") if output else sys.stdout
+    except OSError as e:
+        print(f"Cannot open {output}: {e}", file=sys.stderr)
+        return 1
+    try:
+        data_sampler.sample_once()  # Baseline for CPU percentages
+        started = time.monotonic()
+        seq = 0
+        while not count or seq < count:
+            seq += 1
+            delay = started + seq * interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            record = build_record(data_sampler.sample_once(), seq, top, sort_key)
+            out.write(json.dumps(select_fields(record, paths), separators=(",", ":")))
+            out.write("\n")
+            out.flush()
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # The reader (head, grep -m) went away; point stdout at /dev/null so
+        # the interpreter doesn't fail flushing it at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if lim_monitor.gpu_block:
+            lim_monitor.gpu_block.stop_nvidia_stream()
+        if output:
+            out.close()
+    return 0
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bookmark storage for `lim tp` and the navigator.
+
+bookmarks.json maps a name to {"path", "visits", "last_visit"}; files written
+by older versions ({name: path}) are read as entries with no visits. Every
+change is a read-modify-write under an flock on bookmarks.json.lock, and the
+new file is renamed into place, so concurrent shells recording visits neither
+lose each other's updates nor leave a half-written file behind. Each save also
+rewrites completion_bookmarks.txt, the bookmark names one per line, which bash
+completion reads without starting any process.
+"""
+
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# --- Constants ---
+CONFIG_DIR = Path.home() / ".config/lim"
+BOOKMARKS_FILE = CONFIG_DIR / "bookmarks.json"
+COMPLETION_WORDS_NAME = "completion_bookmarks.txt"
+# Frecency: visits weighted by how recently the bookmark was last used
+RECENCY_WEIGHTS = ((3600, 4.0), (86400, 2.0), (7 * 86400, 0.5))
+OLD_VISIT_WEIGHT = 0.25
+# When the visit total passes this, every count is scaled down so that
+# bookmarks that are no longer used fade out over time
+MAX_TOTAL_VISITS = 10000
+AGING_FACTOR = 0.9
+
+def make_entry(path, visits=0, last_visit=0.0):
+    return {"path": path, "visits": visits, "last_visit": last_visit}
+
+def normalize_bookmarks(data):
+    """{name: entry} from bookmarks.json contents in either format."""
+    if not isinstance(data, dict):
+        return {}
+    bookmarks = {}
+    for name, value in data.items():
+        if isinstance(value, str):
+            bookmarks[name] = make_entry(value)
+        elif isinstance(value, dict) and isinstance(value.get("path"), str):
+            bookmarks[name] = make_entry(
+                value["path"], value.get("visits", 0), value.get("last_visit", 0.0)
+            )
+    return bookmarks
+
+def frecency(entry, now=None):
+    visits = entry.get("visits", 0)
+    if not visits:
+        return 0.0
+    age = (now or time.time()) - entry.get("last_visit", 0.0)
+    for max_age, weight in RECENCY_WEIGHTS:
+        if age < max_age:
+            return visits * weight
+    return visits * OLD_VISIT_WEIGHT
+
+def load_bookmarks(path=None):
+    try:
+        with open(path or BOOKMARKS_FILE, "r", encoding="utf-8") as f:
+            return normalize_bookmarks(json.load(f))
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+def _write_atomic(path, text):
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def save_bookmarks(bookmarks, path=None):
+    """Writes to a temporary file and renames it over bookmarks.json, then the completion words."""
+    path = Path(path or BOOKMARKS_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(path, json.dumps(bookmarks, indent=4))
+    _write_atomic(path.with_name(COMPLETION_WORDS_NAME), "".join(f"{name}\n" for name in sorted(bookmarks)))
+
+@contextmanager
+def locked_bookmarks(path=None):
+    """Yields the current bookmarks under an exclusive lock and saves them afterwards."""
+    path = Path(path or BOOKMARKS_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(f"{path.name}.lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        bookmarks = load_bookmarks(path)
+        yield bookmarks
+        save_bookmarks(bookmarks, path)
+
+def add_bookmark(name, target, path=None):
+    """Adds or repoints a bookmark, keeping its visit history. Returns True if it existed."""
+    with locked_bookmarks(path) as bookmarks:
+        existing = bookmarks.get(name)
+        if existing:
+            existing["path"] = target
+        else:
+            bookmarks[name] = make_entry(target)
+    return existing is not None
+
+def delete_bookmark(name, path=None):
+    with locked_bookmarks(path) as bookmarks:
+        return bookmarks.pop(name, None) is not None
+
+def record_visit(name, path=None, now=None):
+    with locked_bookmarks(path) as bookmarks:
+        entry = bookmarks.get(name)
+        if entry is None:
+            return
+        entry["visits"] += 1
+        entry["last_visit"] = now or time.time()
+        if sum(e["visits"] for e in bookmarks.values()) > MAX_TOTAL_VISITS:
+            for e in bookmarks.values():
+                e["visits"] = int(e["visits"] * AGING_FACTOR)
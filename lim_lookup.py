@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Optional lookup service for lim.
+
+`lim daemon` keeps the container and bookmark indexes in memory and answers
+lookups on a unix socket, so the monitor, navigator, CLI and bash completion
+don't each parse docker_cache.json / bookmarks.json. The files stay the source
+of truth: the daemon re-reads one only when its (mtime, size, inode) changes,
+and every client falls back to reading the files when the daemon isn't running.
+
+The socket lives in a private directory, `$XDG_RUNTIME_DIR/lim-<uid>` (or
+`/tmp/lim-<uid>`), created 0700. Both ends refuse a directory or socket owned
+by another user, and check the peer's UID (SO_PEERCRED) after connecting: a
+daemon started by someone else could otherwise send `lim go`/`lim tp` anywhere.
+
+Protocol: one request per connection, a single line `COMMAND [argument]\\n`.
+The reply is `OK\\n` followed by payload lines, or `ERR <message>\\n`; then the
+server closes the connection.
+
+    PING                      -> OK
+    CONTAINER <name|id>       -> matching containers, one JSON object per line
+                                 (none if not found, several if ambiguous)
+    FIND containers <query>   -> closest container names, one JSON object per
+                                 line, best first
+    CONTAINERS                -> one JSON object per container
+    BOOKMARK <name>           -> bookmark path, or no payload
+    BOOKMARKS                 -> one JSON object {name: {path, visits, last_visit}}
+    FIND bookmarks <query>    -> best fuzzy/frecency matches, one JSON object
+                                 {name, path} per line
+    WORDS containers          -> container names and short IDs, one per line
+    WORDS bookmarks           -> bookmark names, one per line
+"""
+
+import json
+import math
+import os
+import re
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import threading
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+
+import lim_bookmarks
+
+# --- Constants ---
+CONFIG_DIR = Path.home() / ".config/lim"
+JSON_CACHE_FILE = CONFIG_DIR / "docker_cache.json"
+INDEX_FILE = CONFIG_DIR / "docker_index.json"
+BOOKMARKS_FILE = CONFIG_DIR / "bookmarks.json"
+SOCKET_DIR = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or "/tmp", f"lim-{os.getuid()}")
+SOCKET_PATH = os.environ.get("LIM_SOCKET") or os.path.join(SOCKET_DIR, "lookup.sock")
+CLIENT_TIMEOUT = 0.25
+MAX_REQUEST_LENGTH = 4096
+# Candidates listed for an ambiguous ID prefix
+MAX_CANDIDATES = 10
+# Fuzzy matching
+FUZZY_BOUNDARY_CHARS = frozenset("-_./ :@")
+FRECENCY_WEIGHT = 8.0
+
+# --- Container index ---
+#
+# Written by lim_update_cache.py next to docker_cache.json:
+#   {"containers": {short_id: info}, "names": {name: short_id}, "trie": {...}}
+# "trie" is a radix trie over full container IDs: each node maps an edge label
+# to a child node, or to the container's short_id for a leaf. Resolving an ID
+# prefix walks at most one edge per hex digit, independent of container count.
+
+class AmbiguousContainer(LookupError):
+    def __init__(self, identifier, candidates):
+        self.identifier = identifier
+        self.candidates = candidates
+        names = ", ".join(f"{c.get('name', '?')} ({c.get('short_id', '?')})" for c in candidates)
+        super().__init__(f"'{identifier}' matches several containers: {names}")
+
+def build_id_trie(id_to_value):
+    """Builds a radix trie {edge: child-or-value} from {full_id: value}."""
+    def build(ids, depth):
+        groups = {}
+        for full_id in ids:
+            groups.setdefault(full_id[depth], []).append(full_id)
+        node = {}
+        for _, group in sorted(groups.items()):
+            if len(group) == 1:
+                node[group[0][depth:]] = id_to_value[group[0]]
+            else:
+                common = os.path.commonprefix(group)
+                node[common[depth:]] = build(group, len(common))
+        return node
+    return build([i for i in id_to_value if i], 0)
+
+def trie_find(trie, prefix, limit=MAX_CANDIDATES + 1):
+    """Returns up to `limit` values whose ID starts with `prefix`."""
+    node, rest = trie, prefix
+    while rest:
+        for edge, child in node.items():
+            if edge.startswith(rest):
+                rest = ""
+                node = child
+                break
+            if rest.startswith(edge) and isinstance(child, dict):
+                rest = rest[len(edge):]
+                node = child
+                break
+        else:
+            return []
+    found, stack = [], [node]
+    while stack and len(found) < limit:
+        current = stack.pop()
+        if isinstance(current, dict):
+            stack.extend(reversed(list(current.values())))  # Keeps IDs in sorted order
+        else:
+            found.append(current)
+    return found
+
+def build_container_index(containers):
+    """Index for a list of docker_cache.json container entries."""
+    by_short_id = {c["short_id"]: c for c in containers if c.get("short_id")}
+    return {
+        "containers": by_short_id,
+        "names": {c["name"]: s for s, c in by_short_id.items() if c.get("name")},
+        "trie": build_id_trie({c.get("id", ""): s for s, c in by_short_id.items()}),
+    }
+
+def load_container_index():
+    """Reads the prebuilt index, or builds one from docker_cache.json if it is missing."""
+    index_key, cache_key = _file_key(INDEX_FILE), _file_key(JSON_CACHE_FILE)
+    if index_key and (cache_key is None or index_key[0] >= cache_key[0]):
+        index = _load_json(INDEX_FILE, None)
+        if isinstance(index, dict) and {"containers", "names", "trie"} <= index.keys():
+            return index
+    cache = _load_json(JSON_CACHE_FILE, {})
+    return build_container_index(list(cache.get("containers", {}).values()))
+
+def find_containers(identifier, index=None):
+    """Exact name, exact short ID, then ID prefix. Several results mean it is ambiguous."""
+    if index is None:
+        index = load_container_index()
+    containers = index["containers"]
+    short_id = index["names"].get(identifier)
+    if short_id is None and identifier in containers:
+        short_id = identifier
+    if short_id is not None:
+        return [containers[short_id]]
+    if not identifier:
+        return []
+    return [containers[s] for s in trie_find(index["trie"], identifier) if s in containers]
+
+def suggest_containers(identifier, index=None, fuzzy_index=None, limit=MAX_CANDIDATES):
+    """Closest fuzzy name matches, best first, to suggest when find_containers finds nothing.
+
+    They are never used to resolve a name: a typo, or a container missing from
+    a stale cache, must not silently pick another container.
+    `fuzzy_index` is build_fuzzy_index(index["names"]), if the caller keeps one.
+    """
+    if not identifier:
+        return []
+    if index is None:
+        index = load_container_index()
+    names = list(index["names"])
+    ranked = fuzzy_rank(identifier, fuzzy_index or build_fuzzy_index(names), limit=limit)
+    return [index["containers"][index["names"][names[i]]] for _, i in ranked]
+
+# --- Fuzzy matching ---
+#
+# A query matches a name when its characters appear in order (a subsequence),
+# ignoring case. The index is every lowercased name joined into one
+# newline-separated text plus the offset where each line starts: a single
+# anchored regex scan finds the matching lines in C, and only those are scored
+# in Python. Scores favour consecutive characters, matches at word starts and
+# short names; exact names and prefixes rank first.
+
+def build_fuzzy_index(names):
+    """(joined lowercased names, line start offsets), in the order given."""
+    lowered = [name.lower() for name in names]
+    starts = [0]
+    starts.extend(accumulate(len(text) + 1 for text in lowered))
+    return "\n".join(lowered), starts
+
+def _subsequence_pattern(query):
+    # `[^\nc]*c` can only stop at the first `c`, so each character is matched
+    # greedily in one pass; a lazy `.*?c` backtracks polynomially on near misses
+    steps = "".join(f"[^\\n{re.escape(ch)}]*{re.escape(ch)}" for ch in query)
+    return re.compile("(?m)^" + steps + "[^\n]*")
+
+def fuzzy_score(query, text):
+    """Score of lowercased `query` against lowercased `text`, or None if it doesn't match."""
+    if not query:
+        return 0
+    end = -1
+    for ch in query:
+        end = text.find(ch, end + 1)
+        if end < 0:
+            return None
+    # Walk back from the last match for the tightest window ending there
+    positions = [end]
+    for ch in reversed(query[:-1]):
+        positions.append(text.rfind(ch, 0, positions[-1]))
+    positions.reverse()
+    score, previous = 0, -2
+    for pos in positions:
+        score += 16
+        if pos == previous + 1:
+            score += 8
+        elif previous >= 0:
+            score -= min(pos - previous - 1, 8)
+        if pos == 0 or text[pos - 1] in FUZZY_BOUNDARY_CHARS:
+            score += 8
+        previous = pos
+    if text == query:
+        score += 100
+    elif text.startswith(query):
+        score += 32
+    return score - positions[0] // 4 - len(text) // 8
+
+def fuzzy_rank(query, index, bonus=None, limit=None):
+    """[(score, position)] of the matching index entries, best first.
+
+    `bonus` is a per-entry list added to the scores, or a function of the position.
+    """
+    text, starts = index
+    if len(starts) == 1:
+        return []
+    query = query.lower()
+    ranked = []
+    for match in _subsequence_pattern(query).finditer(text):
+        i = bisect_right(starts, match.start()) - 1
+        score = fuzzy_score(query, match.group())
+        if bonus is not None:
+            score += bonus(i) if callable(bonus) else bonus[i]
+        ranked.append((score, i))
+    ranked.sort(key=lambda item: (-item[0], item[1]))
+    return ranked[:limit] if limit else ranked
+
+def frecency_bonus(entries, now=None):
+    now = now or time.time()
+    return [FRECENCY_WEIGHT * math.log1p(lim_bookmarks.frecency(e, now)) for e in entries]
+
+def _entry_bonus(entries, now):
+    return lambda i: FRECENCY_WEIGHT * math.log1p(lim_bookmarks.frecency(entries[i], now))
+
+def rank_bookmarks(query, bookmarks, limit=MAX_CANDIDATES, index=None):
+    """[(name, entry)] best first: exact name, then fuzzy score plus frecency."""
+    if query in bookmarks:
+        return [(query, bookmarks[query])]
+    names = list(bookmarks)
+    entries = [bookmarks[name] for name in names]
+    if index is None:
+        index = build_fuzzy_index(names)
+    ranked = fuzzy_rank(query, index, _entry_bonus(entries, time.time()), limit)
+    return [(names[i], entries[i]) for _, i in ranked]
+
+# --- Ownership checks ---
+
+def is_private_dir(path):
+    """True for a real directory owned by this user with no group/other access."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+def is_own_socket(path):
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+def is_own_peer(sock):
+    """The process on the other end runs as this user (SO_PEERCRED; assumed true where missing)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1] == os.getuid()
+
+# --- Client ---
+
+def query(command, argument=None, socket_path=None):
+    """Sends one request. Returns the payload lines, or None if the daemon is unavailable or not ours."""
+    request = command if argument is None else f"{command} {argument}"
+    socket_path = socket_path or SOCKET_PATH
+    if not is_own_socket(socket_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CLIENT_TIMEOUT)
+            sock.connect(socket_path)
+            if not is_own_peer(sock):
+                return None
+            sock.sendall(request.encode("utf-8") + b"\n")
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    lines = b"".join(chunks).decode("utf-8", "replace").split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    if not lines or lines[0] != "OK":
+        return None
+    return lines[1:]
+
+def is_running(socket_path=None):
+    return query("PING", socket_path=socket_path) is not None
+
+# --- Server ---
+
+def _file_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _load_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return default
+
+class LookupIndex:
+    """In-memory container and bookmark indexes, rebuilt when their files change."""
+
+    def __init__(self, cache_file=JSON_CACHE_FILE, bookmarks_file=BOOKMARKS_FILE):
+        self.cache_file = cache_file
+        self.bookmarks_file = bookmarks_file
+        self.lock = threading.Lock()
+        self.cache_key = None
+        self.bookmarks_key = None
+        self.containers = []
+        self.index = build_container_index([])
+        self.fuzzy_index = build_fuzzy_index([])
+        self.bookmarks = {}
+        self.bookmarks_fuzzy_index = build_fuzzy_index([])
+
+    def refresh(self):
+        with self.lock:
+            key = _file_key(self.cache_file)
+            if key != self.cache_key:
+                data = _load_json(self.cache_file, None) if key else {}
+                if isinstance(data, dict):
+                    self._index_containers(list(data.get("containers", {}).values()))
+                    self.cache_key = key
+            key = _file_key(self.bookmarks_file)
+            if key != self.bookmarks_key:
+                data = _load_json(self.bookmarks_file, None) if key else {}
+                if isinstance(data, dict):
+                    self.bookmarks = lim_bookmarks.normalize_bookmarks(data)
+                    self.bookmarks_fuzzy_index = build_fuzzy_index(self.bookmarks)
+                    self.bookmarks_key = key
+
+    def _index_containers(self, containers):
+        self.containers = containers
+        self.index = build_container_index(containers)
+        self.fuzzy_index = build_fuzzy_index(self.index["names"])
+
+    def handle(self, command, argument):
+        self.refresh()
+        if command == "PING":
+            return []
+        if command == "CONTAINER":
+            return [json.dumps(c) for c in find_containers(argument, self.index)]
+        if command == "CONTAINERS":
+            return [json.dumps(c) for c in self.containers]
+        if command == "BOOKMARK":
+            entry = self.bookmarks.get(argument)
+            return [entry["path"]] if entry else []
+        if command == "BOOKMARKS":
+            return [json.dumps(self.bookmarks)]
+        if command == "FIND" and argument.startswith("bookmarks "):
+            matches = rank_bookmarks(argument[10:], self.bookmarks, index=self.bookmarks_fuzzy_index)
+            return [json.dumps({"name": name, "path": entry["path"]}) for name, entry in matches]
+        if command == "FIND" and argument.startswith("containers "):
+            return [json.dumps(c) for c in suggest_containers(argument[11:], self.index, self.fuzzy_index)]
+        if command == "WORDS" and argument == "containers":
+            return list(self.index["names"]) + list(self.index["containers"])
+        if command == "WORDS" and argument == "bookmarks":
+            return list(self.bookmarks)
+        raise ValueError(f"unknown command: {command} {argument}".strip())
+
+class _LookupHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        if not is_own_peer(self.connection):
+            return
+        line = self.rfile.readline(MAX_REQUEST_LENGTH).decode("utf-8", "replace").strip()
+        command, _, argument = line.partition(" ")
+        try:
+            payload = self.server.index.handle(command.upper(), argument)
+            reply = "OK\n" + "".join(f"{item}\n" for item in payload)
+        except Exception as e:
+            reply = f"ERR {e}\n"
+        try:
+            self.wfile.write(reply.encode("utf-8"))
+        except OSError:
+            pass
+
+class LookupServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, index):
+        self.index = index
+        super().__init__(socket_path, _LookupHandler)
+
+def serve(socket_path=None):
+    """Runs the lookup daemon in the foreground until SIGTERM/SIGINT."""
+    socket_path = socket_path or SOCKET_PATH
+    if socket_path == os.path.join(SOCKET_DIR, "lookup.sock"):
+        try:
+            os.mkdir(SOCKET_DIR, 0o700)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            print(f"lim daemon: cannot create {SOCKET_DIR}: {e}", file=sys.stderr)
+            return 1
+        if not is_private_dir(SOCKET_DIR):
+            print(f"lim daemon: {SOCKET_DIR} is not a 0700 directory owned by you, refusing to use it", file=sys.stderr)
+            return 1
+    if is_running(socket_path):
+        print(f"lim daemon is already running on {socket_path}", file=sys.stderr)
+        return 1
+    if os.path.lexists(socket_path) and not is_own_socket(socket_path):
+        print(f"lim daemon: {socket_path} exists and is not your socket, refusing to replace it", file=sys.stderr)
+        return 1
+    try:
+        os.unlink(socket_path)  # Stale socket from a previous run
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"lim daemon: cannot remove {socket_path}: {e}", file=sys.stderr)
+        return 1
+    index = LookupIndex()
+    index.refresh()
+    old_umask = os.umask(0o177)
+    try:
+        server = LookupServer(socket_path, index)
+    except OSError as e:
+        print(f"lim daemon: cannot listen on {socket_path}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        os.umask(old_umask)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    print(f"lim daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+    return 0
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "query":
+        lines = query(sys.argv[2].upper(), " ".join(sys.argv[3:]) or None) if len(sys.argv) > 2 else None
+        if lines is None:
+            sys.exit(1)
+        for line in lines:
+            print(line)
+        return
+    sys.exit(serve())
+
+if __name__ == "__main__":
+    main()
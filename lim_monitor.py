@@ -22,10 +22,9 @@ try:
     import memory_block
 except ImportError:
     memory_block = None
-try:
-    import gpu_block
-except ImportError:
-    gpu_block = None
+# gpu_block загружается лениво (load_gpu_block), только пока панель GPU видна
+gpu_block = None
+gpu_block_missing = False
 try:
     import misc_block
 except ImportError:
@@ -48,9 +47,46 @@ except ImportError:
     help_content = None
     print("ERROR: help_content.py not found!", file=sys.stderr)
     sys.exit(1)
+try:
+    import sampler
+except ImportError:
+    sampler = None
+    print("ERROR: sampler.py not found!", file=sys.stderr)
+    sys.exit(1)
+try:
+    import render
+except ImportError:
+    render = None
+    print("ERROR: render.py not found!", file=sys.stderr)
+    sys.exit(1)
+try:
+    import profiler
+except ImportError:
+    profiler = None
+    print("ERROR: profiler.py not found!", file=sys.stderr)
+    sys.exit(1)
 
 # --- Основные настройки, Константы, init_gradient_colors ---
 UPDATE_INTERVAL = 1.0
+# Интервалы обновления сборщиков (сек); переопределяются в ~/.config/lim/config.json:
+#   {"refresh_intervals": {"processes": 0.25}, "max_collector_load": 0.5}
+CONFIG_FILE = os.path.expanduser("~/.config/lim/config.json")
+DEFAULT_REFRESH_INTERVALS = {
+    'cpu': 1.0, 'memory': 1.0, 'processes': 1.0, 'gpu': 1.0,
+    'misc': 1.0,     # load average, сеть
+    'system': 15.0,  # hostname, IP, модель CPU, пользователи, диск
+}
+MIN_REFRESH_INTERVAL = 0.1
+INPUT_POLL_MS = 50
+# Дешёвые источники (доли миллисекунды) собираются до первого кадра в этом потоке;
+# список процессов и nvidia-smi дорисовываются, когда их соберёт фоновый поток
+FIRST_FRAME_COLLECTORS = ('cpu', 'memory', 'misc', 'system')
+# LIM_RENDER_STATS=1: строки и байты, переданные curses за прошлый кадр, в нижней рамке списка процессов
+SHOW_RENDER_STATS = os.environ.get("LIM_RENDER_STATS", "0") == "1"
+# LIM_PROFILE_DUMP=<файл>: при выходе записать туда времена из profiler (JSON)
+PROFILE_DUMP_PATH = os.environ.get("LIM_PROFILE_DUMP")
+PROFILER_OVERLAY_WIDTH = 52
+PROFILER_OVERLAY_MAX_ROWS = 16
 PROC_WIN_WIDTH_PERCENT = 0.60
 MIN_TERM_ROWS = 26
 MIN_TERM_COLS = 90
@@ -151,8 +187,7 @@ def addstr_clipped(win, y, x, text, attr=0):
         available_width = w - x
         if available_width <= 0:
             return
-        safe_text = "".join(c if c.isprintable() else '?' for c in str(text))
-        display_text = safe_text[:available_width]
+        display_text = utils.sanitize_text(str(text)[:available_width])
         try:
             win.addstr(y, x, display_text, attr)
         except curses.error:
@@ -426,6 +461,9 @@ def show_process_details(stdscr, pinfo):
     lines.append(f"Memory %  : {pinfo.get('memory_percent', 0.0):.1f}")
     lines.append(f"RSS       : {pinfo.get('rss_mb', 0.0):.1f} MB")
     lines.append(f"VMS       : {pinfo.get('vms_mb', 0.0):.1f} MB")
+    rss_rate = process_block.get_rss_growth_rate(pid) if isinstance(pid, int) else None
+    if rss_rate is not None:
+        lines.append(f"RSS Trend : {rss_rate:+.2f} MB/s")
     try:
         if isinstance(pid, int) and pid > 0:
             proc = psutil.Process(pid)
@@ -671,6 +709,96 @@ def handle_kill_confirmation(stdscr, pinfo):
             stdscr.refresh()
         return result
 
+def draw_profiler_overlay(win, key_attr, value_attr, render_stats):
+    """Панель [t]: время этапов кадра и сборщиков, мс (последнее, p50/p95/max за HISTORY_SAMPLES замеров)."""
+    if not win:
+        return
+    h, w = win.getmaxyx()
+    utils.draw_box(win, "Timings, ms", key_attr | curses.A_BOLD)
+    utils.addstr_clipped(win, 1, 2, f"{'':<20}{'last':>7}{'p50':>7}{'p95':>7}{'max':>7}", key_attr)
+    row = 2
+    for name, last, p50, p95, worst, samples in profiler.summary()[:h - 4]:
+        utils.addstr_clipped(win, row, 2, f"{name[:19]:<20}{last * 1000:7.2f}{p50 * 1000:7.2f}{p95 * 1000:7.2f}{worst * 1000:7.2f}", value_attr)
+        row += 1
+    utils.addstr_clipped(win, h - 2, 2, f"render: {render_stats.rows} rows, {render_stats.bytes} bytes"[:w - 4], value_attr | curses.A_DIM)
+
+def load_gpu_block():
+    global gpu_block, gpu_block_missing
+    if gpu_block is None and not gpu_block_missing:
+        try:
+            import gpu_block as module
+            gpu_block = module
+        except ImportError:
+            gpu_block_missing = True
+    return gpu_block
+
+def load_refresh_config(path=CONFIG_FILE):
+    """
+    Интервалы сборщиков и max_collector_load (доля интервала, которую может занимать
+    один сборщик, см. sampler.Sampler) из config.json; ошибки пишутся в stderr (лог).
+    """
+    intervals = dict(DEFAULT_REFRESH_INTERVALS)
+    max_load = sampler.DEFAULT_MAX_LOAD
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return intervals, max_load
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"config.json не прочитан: {e}", file=sys.stderr)
+        return intervals, max_load
+    if not isinstance(config, dict):
+        return intervals, max_load
+    configured = config.get('refresh_intervals') or {}
+    if isinstance(configured, dict):
+        for name, value in configured.items():
+            if name not in intervals:
+                print(f"refresh_intervals: неизвестный сборщик '{name}'", file=sys.stderr)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+                intervals[name] = max(MIN_REFRESH_INTERVAL, float(value))
+            else:
+                print(f"refresh_intervals.{name}: ожидается число секунд > 0", file=sys.stderr)
+    value = config.get('max_collector_load', max_load)
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and 0 < value <= 1:
+        max_load = float(value)
+    else:
+        print("max_collector_load: ожидается число в (0, 1]", file=sys.stderr)
+    return intervals, max_load
+
+def build_collectors(collect_state):
+    """
+    Сборщики данных для фонового потока sampler.Sampler.
+    collect_state["docker_only"] переключает сбор процессов на docker-режим,
+    collect_state["gpu_visible"] отключает опрос GPU, пока панели нет на экране.
+    """
+    collectors = []
+    if cpu_block:
+        collectors.append(("cpu", cpu_block.collect_cpu_data))
+    if memory_block:
+        collectors.append(("memory", memory_block.collect_memory_data))
+
+    def collect_gpu():
+        if not collect_state["gpu_visible"]:
+            return None
+        module = load_gpu_block()
+        return module.collect_gpu_data() if module else None
+
+    collectors.append(("gpu", collect_gpu))
+    if misc_block:
+        collectors.append(("misc", misc_block.collect_activity_data))
+        collectors.append(("system", misc_block.collect_system_data))
+
+    def collect_process_rows():
+        docker_only = collect_state["docker_only"]
+        if docker_only:
+            rows = process_block.collect_docker_processes()
+        else:
+            rows = process_block.collect_processes()
+        return {"docker_only": docker_only, "rows": tuple(rows)}
+
+    collectors.append(("processes", collect_process_rows))
+    return collectors
+
 def main(stdscr):
     # --- Инициализация и цвета ---
     has_colors = False
@@ -732,6 +860,8 @@ def main(stdscr):
     current_sort_key = 'rss'
     possible_sort_keys = ['rss', 'cpu', 'mem', 'pid', 'vms', 'name']
     win_proc, win_cpu, win_mem, win_gpu, win_misc = None, None, None, None, None
+    win_profiler = None
+    show_profiler = False
     last_rows, last_cols = -1, -1
     current_mode = 'normal'
     selected_line_abs = 0
@@ -740,10 +870,25 @@ def main(stdscr):
     total_processes_in_list = 0
     is_selecting = False
     term_resized = True
+    redraw_needed = True
+    collect_state = {'docker_only': False, 'gpu_visible': True}
+    data_sampler = None
+    last_drawn_seq = -1
+    layout_gpu_count = None
+    sorted_cache_key = None
+    sorted_cache = []
+    render_stats = render.FrameStats()
 
     try:
+        refresh_intervals, max_collector_load = load_refresh_config()
+        data_sampler = sampler.Sampler(
+            build_collectors(collect_state), UPDATE_INTERVAL,
+            on_timing=lambda name, cost: profiler.record(f"collect {name}", cost),
+            intervals=refresh_intervals, max_load=max_collector_load)
+        data_sampler.prime([name for name, _ in data_sampler.collectors if name in FIRST_FRAME_COLLECTORS])
+        data_sampler.start()
         while True:
-            loop_start_time = time.time()
+            snapshot = data_sampler.latest()
             if term_resized:
                 rows, cols = stdscr.getmaxyx()
                 if rows < MIN_TERM_ROWS or cols < MIN_TERM_COLS:
@@ -762,10 +907,10 @@ def main(stdscr):
                     if input_key == ord('q'):
                         raise StopIteration
                     continue
-            try:
-                gpu_count = gpu_block.get_gpu_count() if gpu_block else 0
-            except:
-                gpu_count = 0
+            gpu_count = (snapshot.data.get('gpu') or {}).get('count', 0)
+            if gpu_count != layout_gpu_count:
+                layout_gpu_count = gpu_count
+                term_resized = True
             proc_w = int(cols * PROC_WIN_WIDTH_PERCENT)
             proc_h = rows
             proc_x = 0
@@ -801,7 +946,7 @@ def main(stdscr):
                 def safe_newwin(h, w, y, x, name):
                     if h > 0 and w > 0 and y >= 0 and y + h <= rows and x >= 0 and x + w <= cols:
                         try:
-                            return curses.newwin(h, w, y, x)
+                            return render.RenderWindow(curses.newwin(h, w, y, x), render_stats)
                         except curses.error:
                             return None
                     else:
@@ -811,26 +956,38 @@ def main(stdscr):
                 win_mem = safe_newwin(mem_h, right_col_w, mem_y, right_col_x, "mem")
                 win_gpu = safe_newwin(gpu_h, right_col_w, gpu_y, right_col_x, "gpu")
                 win_misc = safe_newwin(misc_h, right_col_w, misc_y, right_col_x, "misc")
+                # Панель профилировщика лежит поверх правого нижнего угла списка процессов
+                prof_h = min(PROFILER_OVERLAY_MAX_ROWS, proc_h - 2)
+                win_profiler = safe_newwin(prof_h, PROFILER_OVERLAY_WIDTH, proc_y + proc_h - 1 - prof_h, proc_x + proc_w - 1 - PROFILER_OVERLAY_WIDTH, "profiler")
+                collect_state['gpu_visible'] = win_gpu is not None
                 last_rows, last_cols = rows, cols
                 selected_line_abs = 0
                 scroll_offset = 0
                 is_selecting = False
                 term_resized = False
+                redraw_needed = True
                 stdscr.refresh()
             visible_proc_height = win_proc.getmaxyx()[0] - (PROC_CONTENT_START_ROW + 1) if win_proc else 0
             visible_proc_height = max(0, visible_proc_height)
+            proc_data = snapshot.data.get('processes') or {'docker_only': False, 'rows': ()}
+            proc_rows = proc_data['rows']
+            if current_mode == 'docker' and not proc_data['docker_only']:
+                proc_rows = [p for p in proc_rows if p.get('docker_info')]
             if is_selecting or current_mode == 'killer':
                 if not process_list_cache:
-                    process_list_cache = process_block.get_processes(current_sort_key) if process_block else []
-                    if current_mode == 'docker':
-                        process_list_cache = [p for p in process_list_cache if p.get('docker_info')]
+                    with profiler.timed("sort"):
+                        process_list_cache = process_block.sort_processes(proc_rows, current_sort_key)
                     total_processes_in_list = len(process_list_cache)
                 processes_to_use = process_list_cache
             else:
                 process_list_cache = []
-                processes_to_use = process_block.get_processes(current_sort_key) if process_block else []
-                if current_mode == 'docker':
-                    processes_to_use = [p for p in processes_to_use if p.get('docker_info')]
+                sort_limit = scroll_offset + visible_proc_height
+                cache_key = (snapshot.seq, current_mode, current_sort_key, sort_limit)
+                if cache_key != sorted_cache_key:
+                    with profiler.timed("sort"):
+                        sorted_cache = process_block.sort_processes(proc_rows, current_sort_key, sort_limit)
+                    sorted_cache_key = cache_key
+                processes_to_use = sorted_cache
                 total_processes_in_list = len(processes_to_use)
             selected_line_abs = max(0, min(total_processes_in_list - 1, selected_line_abs)) if total_processes_in_list > 0 else 0
             if selected_line_abs < scroll_offset:
@@ -841,37 +998,68 @@ def main(stdscr):
             scroll_offset = max(0, min(scroll_offset, max_scroll)) if total_processes_in_list > visible_proc_height else 0
             selected_line_rel = selected_line_abs - scroll_offset
             processes_to_display = processes_to_use[scroll_offset: scroll_offset + visible_proc_height]
-            if win_cpu and cpu_block:
-                cpu_block.draw_cpu_block_content(win_cpu, key_attr, value_attr, cpu_gradient_colors, UPDATE_INTERVAL)
-            if win_mem and memory_block:
-                memory_block.draw_memory_block_content(win_mem, key_attr, value_attr, bar_colors)
-            if win_gpu and gpu_block:
-                gpu_block.draw_gpu_block_content(win_gpu, key_attr, value_attr, bar_colors, gpu_temp_colors, gpu_util_colors)
-            if win_misc and misc_block:
-                misc_block.draw_misc_block_content(win_misc, key_attr, value_attr, disk_high_attr, net_attr, load_colors)
-            if win_proc and process_block:
-                actual_procs_shown = process_block.draw_process_block_content(
-                    win_proc, key_attr, value_attr, cmd_attr, user_attrs, rss_color_map, cpu_high_attr,
-                    sort_key=current_sort_key, mode=current_mode, selected_line=selected_line_rel,
-                    process_list=processes_to_display, docker_attr=docker_attr, docker_container_attr=docker_container_attr,
-                    killer_attr=killer_attr, is_selecting=is_selecting
-                )
-            for win in [win_proc, win_cpu, win_mem, win_gpu, win_misc]:
-                if win:
+            if redraw_needed or snapshot.seq != last_drawn_seq:
+                if redraw_needed:
+                    # Окна отрисовываются по изменённым строкам; после попапов и справки,
+                    # нарисованных поверх stdscr, curses должен заново вывести окна целиком
+                    for win in [win_proc, win_cpu, win_mem, win_gpu, win_misc]:
+                        if win:
+                            win.touchwin()
+                prev_rows, prev_bytes = render_stats.rows, render_stats.bytes
+                render_stats.begin_frame()
+                cpu_data = snapshot.data.get('cpu')
+                mem_data = snapshot.data.get('memory')
+                gpu_data = snapshot.data.get('gpu')
+                misc_data = snapshot.data.get('misc')
+                if misc_data and snapshot.data.get('system'):
+                    misc_data = {**snapshot.data['system'], **misc_data}
+                else:
+                    misc_data = None
+                if win_cpu and cpu_data:
+                    with profiler.timed("draw cpu"):
+                        cpu_block.draw_cpu_block_content(win_cpu, key_attr, value_attr, cpu_gradient_colors, UPDATE_INTERVAL, data=cpu_data)
+                if win_mem and mem_data:
+                    with profiler.timed("draw memory"):
+                        memory_block.draw_memory_block_content(win_mem, key_attr, value_attr, bar_colors, data=mem_data)
+                if win_gpu and gpu_data:
+                    with profiler.timed("draw gpu"):
+                        gpu_block.draw_gpu_block_content(win_gpu, key_attr, value_attr, bar_colors, gpu_temp_colors, gpu_util_colors, data=gpu_data)
+                if win_misc and misc_data:
+                    with profiler.timed("draw misc"):
+                        misc_block.draw_misc_block_content(win_misc, key_attr, value_attr, disk_high_attr, net_attr, load_colors, data=misc_data)
+                if win_proc and process_block:
+                    with profiler.timed("draw processes"):
+                        actual_procs_shown = process_block.draw_process_block_content(
+                            win_proc, key_attr, value_attr, cmd_attr, user_attrs, rss_color_map, cpu_high_attr,
+                            sort_key=current_sort_key, mode=current_mode, selected_line=selected_line_rel,
+                            process_list=processes_to_display, docker_attr=docker_attr, docker_container_attr=docker_container_attr,
+                            killer_attr=killer_attr, is_selecting=is_selecting, sample_time=snapshot.timestamp
+                        )
+                    if SHOW_RENDER_STATS:
+                        proc_win_h, proc_win_w = win_proc.getmaxyx()
+                        stats_text = f" rows {prev_rows} bytes {prev_bytes} ".ljust(22)
+                        utils.addstr_clipped(win_proc, proc_win_h - 1, max(1, proc_win_w - len(stats_text) - 2), stats_text, curses.A_DIM)
+                profiler.end_frame()
+                if show_profiler and win_profiler:
+                    draw_profiler_overlay(win_profiler, key_attr, value_attr, render_stats)
+                    # Строки списка процессов под панелью могли перекрыть её, выводим её целиком
+                    win_profiler.touchwin()
+                with profiler.timed("noutrefresh"):
+                    for win in [win_proc, win_cpu, win_mem, win_gpu, win_misc, win_profiler if show_profiler else None]:
+                        if win:
+                            try:
+                                win.noutrefresh()
+                            except curses.error:
+                                pass
+                with profiler.timed("doupdate"):
                     try:
-                        win.noutrefresh()
+                        curses.doupdate()
                     except curses.error:
                         pass
-            try:
-                curses.doupdate()
-            except curses.error:
-                pass
+                last_drawn_seq = snapshot.seq
             input_key = -1
             redraw_needed = False
-            time_now = time.time()
-            remaining_time = (loop_start_time + UPDATE_INTERVAL) - time_now
-            timeout_ms = max(1, int(remaining_time * 1000)) if remaining_time > 0 else 1
-            stdscr.timeout(timeout_ms)
+            stdscr.timeout(INPUT_POLL_MS)
             input_key = stdscr.getch()
             if input_key != -1:
                 redraw_needed = True
@@ -880,8 +1068,12 @@ def main(stdscr):
                 elif input_key == ord('h'):
                     show_help_fullscreen(stdscr)
                     redraw_needed = True
+                elif input_key == ord('t'):
+                    show_profiler = not show_profiler
                 elif input_key == ord('d'):
                     current_mode = 'normal' if current_mode == 'docker' else 'docker'
+                    collect_state['docker_only'] = current_mode == 'docker'
+                    data_sampler.request_refresh()
                     selected_line_abs = 0
                     scroll_offset = 0
                     is_selecting = False
@@ -993,8 +1185,6 @@ def main(stdscr):
                     is_selecting = False
                     process_list_cache = []
                     redraw_needed = False
-                else:
-                    redraw_needed = False
     except StopIteration:
         pass
     except KeyboardInterrupt:
@@ -1015,6 +1205,16 @@ def main(stdscr):
         print(f"------------------------\nError: {e}", file=sys.stderr)
         sys.exit(1)
     finally:
+        if data_sampler:
+            data_sampler.stop()
+        if gpu_block:
+            gpu_block.stop_nvidia_stream()
+        process_block.save_rss_history()
+        if PROFILE_DUMP_PATH:
+            try:
+                profiler.dump(PROFILE_DUMP_PATH)
+            except OSError as e:
+                print(f"Profile dump failed: {e}", file=sys.stderr)
         if 'stdscr' in locals() and stdscr and not curses.isendwin():
             try:
                 curses.nocbreak()
@@ -1025,7 +1225,11 @@ def main(stdscr):
             except:
                 pass
 
-if __name__ == "__main__":
+def run():
+    """
+    Точка входа монитора: журнал ошибок в /tmp, проверка зависимостей и
+    curses.wrapper(main). Вызывается из `lim` в том же процессе.
+    """
     original_stderr = sys.stderr
     log_file_path = "/tmp/py_monitor_errors.log"
     try:
@@ -1056,4 +1260,7 @@ if __name__ == "__main__":
         print(f"(Check {log_file_path} for errors)", file=sys.stderr)
         sys.exit(1)
     finally:
-        sys.stderr = original_stderr
\ No newline at end of file
+        sys.stderr = original_stderr
+
+if __name__ == "__main__":
+    run()
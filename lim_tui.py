@@ -6,41 +6,55 @@ import curses.textpad
 import json
 import os
 import sys
+import time
 from pathlib import Path
 
+import lim_bookmarks
+
+try:
+    import lim_lookup
+except ImportError:
+    lim_lookup = None
+
 # --- Constants ---
 CONFIG_DIR = Path.home() / ".config/lim"
 JSON_CACHE_FILE = CONFIG_DIR / "docker_cache.json"
-BOOKMARKS_FILE = CONFIG_DIR / "bookmarks.json"
-GO_SCRIPT_NAME = 'l.sh'
-RETURN_SCRIPT_NAME = 'b.sh'
 
 # --- Data Loading ---
 
+# Last parsed cache file: (mtime_ns, size, inode) and its containers
+docker_cache_state = {"key": None, "containers": []}
+
 def load_docker_cache():
-    """Loads Docker containers from the cache."""
-    if not JSON_CACHE_FILE.is_file(): return []
+    """Loads Docker containers from the cache, skipping the parse if the file is unchanged."""
     try:
-        with JSON_CACHE_FILE.open('r', encoding='utf-8') as f:
-            data = json.load(f)
-        return list(data.get('containers', {}).values())
-    except (json.JSONDecodeError, OSError):
+        st = JSON_CACHE_FILE.stat()
+    except OSError:
+        docker_cache_state.update(key=None, containers=[])
         return []
-
-def load_bookmarks():
-    """Loads directory bookmarks from their file."""
-    if not BOOKMARKS_FILE.is_file(): return {}
+    key = (st.st_mtime_ns, st.st_size, st.st_ino)
+    if key == docker_cache_state["key"]:
+        return list(docker_cache_state["containers"])
     try:
-        with BOOKMARKS_FILE.open('r', encoding='utf-8') as f:
-            return json.load(f)
+        with JSON_CACHE_FILE.open('r', encoding='utf-8') as f:
+            data = json.load(f)
+        containers = list(data.get('containers', {}).values())
     except (json.JSONDecodeError, OSError):
-        return {}
+        return list(docker_cache_state["containers"])
+    docker_cache_state.update(key=key, containers=containers)
+    return list(containers)
 
-def save_bookmarks(bookmarks):
-    """Saves bookmarks to their file."""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    with BOOKMARKS_FILE.open('w', encoding='utf-8') as f:
-        json.dump(bookmarks, f, indent=4)
+def fetch_navigation_data():
+    """Returns (containers, bookmarks) from the lim daemon if it is running, else from the files."""
+    if lim_lookup:
+        containers = lim_lookup.query("CONTAINERS")
+        bookmarks = lim_lookup.query("BOOKMARKS")
+        if containers is not None and bookmarks:
+            try:
+                return [json.loads(c) for c in containers], lim_bookmarks.normalize_bookmarks(json.loads(bookmarks[0]))
+            except ValueError:
+                pass
+    return load_docker_cache(), lim_bookmarks.load_bookmarks()
 
 # --- Core TUI Logic ---
 
@@ -52,7 +66,12 @@ class TuiApp:
         self.scroll_offset = 0
         self.status_message = ""
         self.status_type = "info"
+        self.all_items = []
+        self.fuzzy_index = None
+        self.frecency_bonus = []
         self.combined_list = []
+        self.filter_query = ""
+        self.filter_mode = False
 
     def init_curses(self):
         """Initialize curses settings and colors."""
@@ -68,7 +87,7 @@ class TuiApp:
             curses.init_pair(4, curses.COLOR_RED, -1)
             curses.init_pair(5, curses.COLOR_WHITE, -1)
             curses.init_pair(6, curses.COLOR_MAGENTA, -1) # For bookmarks
-            curses.init_pair(7, curses.A_REVERSE, -1) # Selection
+            curses.init_pair(7, -1, -1) # Selection, drawn with A_REVERSE
     
     def get_style(self, pair_index, bold=False):
         """Get curses style attribute."""
@@ -119,23 +138,38 @@ class TuiApp:
         return list_win, status_win, instruct_win
 
     def update_data(self):
-        """Load and merge Docker and bookmark data."""
-        self.combined_list = []
+        """Load and merge Docker and bookmark data, most used bookmarks first."""
+        self.all_items = []
+        containers, bookmarks = fetch_navigation_data()
+        now = time.time()
         
         # Add bookmarks
-        bookmarks = load_bookmarks()
-        for name, path in sorted(bookmarks.items()):
-            self.combined_list.append({
-                'type': 'bookmark', 'name': name, 'path': path, 'status': 'Bookmark'
+        for name, entry in sorted(bookmarks.items(), key=lambda b: (-lim_bookmarks.frecency(b[1], now), b[0])):
+            self.all_items.append({
+                'type': 'bookmark', 'name': name, 'path': entry['path'], 'status': 'Bookmark', 'entry': entry
             })
 
         # Add Docker containers
-        containers = load_docker_cache()
         for c in sorted(containers, key=lambda i: i.get('name', '')):
-            self.combined_list.append({
+            self.all_items.append({
                 'type': 'docker', 'name': c.get('name', 'N/A'), 'path': c.get('compose_path', 'N/A'),
                 'status': c.get('status', 'N/A'), 'id': c.get('id', 'N/A')
             })
+
+        # Fuzzy index over names, rebuilt only when the data is reloaded
+        if lim_lookup:
+            self.fuzzy_index = lim_lookup.build_fuzzy_index([item['name'] for item in self.all_items])
+            self.frecency_bonus = lim_lookup.frecency_bonus([item.get('entry', {}) for item in self.all_items], now)
+        self.apply_filter()
+
+    def apply_filter(self):
+        """Ranks items against the filter query; without one, shows everything."""
+        if not self.filter_query or not lim_lookup:
+            self.combined_list = list(self.all_items)
+        else:
+            ranked = lim_lookup.fuzzy_rank(self.filter_query, self.fuzzy_index, self.frecency_bonus)
+            self.combined_list = [self.all_items[i] for _, i in ranked]
+        self.current_row_idx = min(self.current_row_idx, max(0, len(self.combined_list) - 1))
     
     def draw_list(self, win):
         """Draw the combined list of items."""
@@ -157,7 +191,7 @@ class TuiApp:
             else: # bookmark
                 style = self.get_style(6) # Magenta for bookmark
             
-            if is_selected: style = self.get_style(7)
+            if is_selected: style = self.get_style(7) | curses.A_REVERSE
             
             path_style = style
             if not item.get('path') or item.get('path') == 'N/A':
@@ -181,8 +215,11 @@ class TuiApp:
         """Draw the keybinding instructions."""
         win.erase()
         h, w = win.getmaxyx()
-        instruct = "↑/↓: Nav | g/Enter: Go | i: Inspect | a: Add Bookmark | d: Del Bookmark | q: Quit"
-        self.safe_addstr(win, 0, 0, instruct.ljust(w), self.get_style(7))
+        if self.filter_mode:
+            instruct = f"Filter: {self.filter_query}_  | Enter: Go | ↑/↓: Nav | Esc: Clear"
+        else:
+            instruct = "↑/↓: Nav | g/Enter: Go | /: Filter | i: Inspect | a: Add Bookmark | d: Del Bookmark | q: Quit"
+        self.safe_addstr(win, 0, 0, instruct.ljust(w), self.get_style(7) | curses.A_REVERSE)
     
     def get_input_from_popup(self, prompt):
         """Display a popup to get text input from the user."""
@@ -220,9 +257,7 @@ class TuiApp:
         if not path:
             path = os.getcwd() # Default to current dir
 
-        bookmarks = load_bookmarks()
-        bookmarks[name] = str(Path(path).resolve())
-        save_bookmarks(bookmarks)
+        lim_bookmarks.add_bookmark(name, str(Path(path).resolve()))
         self.set_status(f"Bookmark '{name}' added.", "info")
         self.update_data()
         
@@ -235,16 +270,28 @@ class TuiApp:
                 return
 
             name_to_del = item['name']
-            bookmarks = load_bookmarks()
-            if name_to_del in bookmarks:
-                del bookmarks[name_to_del]
-                save_bookmarks(bookmarks)
+            if lim_bookmarks.delete_bookmark(name_to_del):
                 self.set_status(f"Bookmark '{name_to_del}' deleted.", "info")
                 self.update_data()
                 self.current_row_idx = max(0, self.current_row_idx - 1)
             else:
                 self.set_status(f"Bookmark '{name_to_del}' not found.", "warn")
         
+    def handle_filter_key(self, key):
+        """Edits the filter query. Returns False for keys the main loop should handle (arrows, Enter)."""
+        if key == 27: # Esc clears the filter
+            self.filter_mode = False
+            self.filter_query = ""
+        elif key in (curses.KEY_BACKSPACE, 127, 8):
+            self.filter_query = self.filter_query[:-1]
+        elif 32 <= key < 127:
+            self.filter_query += chr(key)
+            self.current_row_idx = 0
+        else:
+            return False
+        self.apply_filter()
+        return True
+
     def set_status(self, msg, type="info"):
         self.status_message = msg
         self.status_type = type
@@ -274,6 +321,8 @@ class TuiApp:
             
             num_items = len(self.combined_list)
             
+            if self.filter_mode and self.handle_filter_key(key):
+                continue
             if key in (ord('q'), 27): # q or Esc
                 break
             elif key == curses.KEY_UP:
@@ -282,10 +331,17 @@ class TuiApp:
                 if num_items > 0: self.current_row_idx = (self.current_row_idx + 1) % num_items
             elif key == curses.KEY_RESIZE:
                 continue
+            elif key == ord('/'):
+                self.filter_mode = True
             elif key in (ord('g'), curses.KEY_ENTER, 10, 13):
                 if self.current_row_idx < num_items:
-                    path = self.combined_list[self.current_row_idx]['path']
-                    return {'action': 'go', 'path': path}
+                    item = self.combined_list[self.current_row_idx]
+                    if item['type'] == 'bookmark':
+                        try:
+                            lim_bookmarks.record_visit(item['name'])
+                        except OSError:
+                            pass
+                    return {'action': 'go', 'path': item['path']}
             elif key == ord('i'):
                 if self.current_row_idx < num_items and self.combined_list[self.current_row_idx]['type'] == 'docker':
                     return {'action': 'inspect', 'id': self.combined_list[self.current_row_idx]['id']}
@@ -300,10 +356,10 @@ class TuiApp:
 
 # --- Standalone Execution ---
 
-if __name__ == '__main__':
-    action_details = None
+def run_tui():
+    """Runs the navigator and returns the chosen action ({'action': 'go'|'inspect', ...}) or None."""
     try:
-        action_details = curses.wrapper(lambda stdscr: TuiApp(stdscr).run())
+        return curses.wrapper(lambda stdscr: TuiApp(stdscr).run())
     except curses.error as e:
         print(f"Ошибка Curses: {e}", file=sys.stderr)
         sys.exit(1)
@@ -316,12 +372,18 @@ if __name__ == '__main__':
         traceback.print_exc()
         sys.exit(1)
 
+def main():
+    """Standalone entry point; `lim tui` calls run_tui() and handles the action itself."""
+    action_details = run_tui()
     if action_details:
         action = action_details.get('action')
         if action == 'go':
-            create_navigation_scripts(action_details.get('path'))
+            print(f"Директория docker-compose: {action_details.get('path')}")
         elif action == 'inspect':
             container_id = action_details.get('id')
             if container_id:
                 print(f"Запуск 'docker inspect' для {container_id[:12]}...")
-                os.system(f"docker inspect {container_id}")
\ No newline at end of file
+                os.system(f"docker inspect {container_id}")
+
+if __name__ == '__main__':
+    main()
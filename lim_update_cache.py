@@ -1,18 +1,62 @@
-import docker  # Для взаимодействия с Docker API
+import argparse  # Для разбора аргументов командной строки
 import json  # Для работы с JSON-данными
 import os  # Для операций с файловой системой
 import time  # Для работы со временем
 import datetime  # Для работы с датой и временем
 import sys  # Для доступа к stderr
 from pathlib import Path  # Для удобной работы с путями
-from typing import Dict, List, Optional, Any  # Для аннотаций типов
+from typing import TYPE_CHECKING, Dict, List, Optional, Any  # Для аннотаций типов
+
+# Docker SDK импортируется лениво (load_docker) - только когда нужен демон
+if TYPE_CHECKING:
+    import docker
+
+try:
+    import lim_lookup  # Индекс контейнеров для lim go / lim inspect
+except ImportError:
+    lim_lookup = None
 
 #  Путь к файлу кэша Docker (пользователь может изменить)
 CACHE_FILE = Path.home() / ".config/lim/docker_cache.json"
+# Индекс для поиска контейнера по имени и префиксу ID (см. lim_lookup.py)
+INDEX_FILE = Path.home() / ".config/lim/docker_index.json"
+# Имена и короткие ID контейнеров по одному в строке - для автодополнения bash
+# (lim-completion.bash читает файл встроенным mapfile, без jq и docker ps)
+COMPLETION_WORDS_FILE = Path.home() / ".config/lim/completion_containers.txt"
 
 # Время жизни кэша (в секундах) - по умолчанию 5 минут
 CACHE_EXPIRATION = 300  # 5 минут в секундах
 
+# События контейнеров, после которых запись в кэше обновляется или удаляется
+CONTAINER_UPDATE_EVENTS = {
+    "create",
+    "start",
+    "restart",
+    "die",
+    "stop",
+    "kill",
+    "pause",
+    "unpause",
+    "rename",
+    "update",
+}
+CONTAINER_REMOVE_EVENTS = {"destroy"}
+
+# Пауза перед переподключением после потери потока событий (в секундах)
+EVENTS_RETRY_DELAY = 5
+
+# При большем числе контейнеров кэш пишется без отступов (если в config.json
+# не задано "compact_cache": true/false)
+COMPACT_CACHE_THRESHOLD = 100
+
+
+def load_docker():
+    """Импортирует Docker SDK при первом обращении к демону."""
+
+    import docker  # Для взаимодействия с Docker API
+
+    return docker
+
 
 def load_config() -> Dict[str, Any]:
     """
@@ -76,29 +120,82 @@ def load_docker_cache() -> Dict[str, Any]:
     return cache
 
 
-def save_docker_cache(cache_data: Dict[str, Any]) -> None:
-    """Saves the Docker cache to a file."""
+def write_json_atomic(path: Path, data: Any, compact: bool) -> None:
+    """Writes JSON to a temporary file and renames it over `path`."""
+
+    dump_options: Dict[str, Any] = (
+        {"separators": (",", ":")} if compact else {"indent": 4}
+    )
+    write_text_atomic(path, json.dumps(data, **dump_options))
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Writes text to a temporary file and renames it over `path`."""
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)  # Атомарная замена файла
+    except IOError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def save_docker_cache(
+    cache_data: Dict[str, Any], compact: Optional[bool] = None
+) -> None:
+    """
+    Saves the Docker cache to a file.
 
-    cache_dir = Path.home() / ".config/lim"  # Определяем путь к директории кэша
+    The file is written to a temporary name and renamed over the old one, so
+    readers never see a half-written cache. compact=None picks the compact
+    form above COMPACT_CACHE_THRESHOLD containers. The lookup index used by
+    `lim go` / `lim inspect` and the completion word list are rewritten
+    alongside it.
+    """
+
+    cache_dir = CACHE_FILE.parent  # Определяем путь к директории кэша
     cache_dir.mkdir(
         parents=True, exist_ok=True
     )  # Создаем директорию, если она не существует
 
+    if compact is None:
+        compact = len(cache_data.get("containers", {})) > COMPACT_CACHE_THRESHOLD
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache_data, f, indent=4)
+        write_json_atomic(CACHE_FILE, cache_data, compact)
     except IOError:
         print(f"Error saving cache to {CACHE_FILE}", file=sys.stderr)
+        return
+    containers = cache_data.get("containers", {}).values()
+    words = sorted(c["name"] for c in containers if c.get("name"))
+    words += sorted(c["short_id"] for c in containers if c.get("short_id"))
+    try:
+        write_text_atomic(COMPLETION_WORDS_FILE, "".join(f"{w}\n" for w in words))
+    except IOError:
+        print(f"Error saving completion words to {COMPLETION_WORDS_FILE}", file=sys.stderr)
+    if lim_lookup is None:
+        return
+    index = lim_lookup.build_container_index(
+        list(cache_data.get("containers", {}).values())
+    )
+    try:
+        write_json_atomic(INDEX_FILE, index, True)  # Индекс всегда компактный
+    except IOError:
+        print(f"Error saving container index to {INDEX_FILE}", file=sys.stderr)
 
 
-def find_compose_path(container: docker.models.containers.Container) -> Optional[str]:
+def find_compose_path(labels: Dict[str, str]) -> Optional[str]:
     """
     Находит директорию docker-compose.yml для контейнера.
 
     Ищет путь в метках контейнера.
     """
 
-    labels = container.labels
+    labels = labels or {}
     compose_workdir = labels.get(
         "com.docker.compose.project.working_dir"
     )  # Пытаемся получить путь из метки com.docker.compose.project.working_dir
@@ -126,13 +223,63 @@ def find_compose_path(container: docker.models.containers.Container) -> Optional
     return None
 
 
-def update_docker_cache(config: Dict[str, Any]) -> None:
+def get_image_tags(client: "docker.DockerClient") -> Dict[str, str]:
+    """
+    Возвращает первый тег каждого образа (ImageID -> тег).
+
+    Один запрос /images/json вместо container.image.tags на каждый контейнер.
+    """
+
+    image_tags: Dict[str, str] = {}
+    for image in client.api.images():
+        tags = [t for t in image.get("RepoTags") or [] if t != "<none>:<none>"]
+        if tags:
+            image_tags[image["Id"]] = tags[0]
+    return image_tags
+
+
+def build_container_info(
+    summary: Dict[str, Any], image_tags: Dict[str, str]
+) -> Dict[str, Any]:
+    """
+    Собирает запись кэша из краткого описания контейнера (/containers/json).
+
+    Все нужные поля уже есть в ответе списка, поэтому inspect не требуется.
+    """
+
+    full_id = summary["Id"]
+    names = summary.get("Names") or []
+    fallback_name = names[0].lstrip("/") if names else ""
+    name = next(
+        (n[1:] for n in names if n.count("/") == 1), fallback_name
+    )  # Основное имя (без алиасов ссылок вида /other/alias)
+    return {
+        "id": full_id,
+        "short_id": full_id[:12],
+        "name": name,
+        "image": image_tags.get(summary.get("ImageID"), "unknown"),
+        "status": summary.get("State", "unknown"),
+        "compose_path": find_compose_path(summary.get("Labels")),
+    }
+
+
+def update_docker_cache(
+    config: Dict[str, Any],
+    client: Optional["docker.DockerClient"] = None,
+    image_tags: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
     """
     Обновляет кэш Docker.
 
     Получает информацию о запущенных контейнерах и сохраняет ее в файл кэша.
+    Если передан image_tags, он заполняется тегами образов для повторного
+    использования. Возвращает сохраненные данные.
     """
 
+    if image_tags is None:
+        image_tags = {}
+    docker = load_docker()
+
     cache_data: Dict[str, Any] = {
         "containers": {},
         "timestamp": time.time(),
@@ -140,44 +287,24 @@ def update_docker_cache(config: Dict[str, Any]) -> None:
     }  # Инициализируем структуру данных для кэша
 
     try:
-        client = docker.from_env()  # Подключаемся к Docker Daemon
-        containers = client.containers.list(
-            all=True
-        )  # Получаем список всех контейнеров (запущенных и остановленных)
-
-        for container in containers:
+        if client is None:
+            client = docker.from_env()  # Подключаемся к Docker Daemon
+        # Два запроса на весь кэш: список всех контейнеров (запущенных и
+        # остановленных) и список образов для тегов
+        summaries = client.api.containers(all=True)
+        image_tags.update(get_image_tags(client))
+
+        for summary in summaries:
             try:
-                container.reload()  # Обновляем информацию о контейнере (на случай изменений)
-                container_id = container.short_id  # Получаем короткий ID контейнера
-                compose_path = find_compose_path(
-                    container
-                )  # Находим путь к docker-compose.yml
-                image_tag = (
-                    container.image.tags[0]
-                    if container.image and container.image.tags
-                    else "unknown"
-                )  # Получаем тег образа, если есть
-
-                container_info: Dict[str, Any] = {
-                    "id": container.id,
-                    "short_id": container.short_id,
-                    "name": container.name,
-                    "image": image_tag,
-                    "status": container.status,
-                    "compose_path": compose_path,
-                }  # Собираем информацию о контейнере
+                container_info = build_container_info(
+                    summary, image_tags
+                )  # Собираем информацию о контейнере
                 cache_data["containers"][
-                    container_id
+                    container_info["short_id"]
                 ] = container_info  # Добавляем информацию в кэш
-
-            except docker.errors.NotFound as e:
-                print(
-                    f"Предупреждение: Контейнер не найден во время обновления кэша: {e}",
-                    file=sys.stderr,
-                )
             except Exception as e:
                 print(
-                    f"Ошибка при обработке контейнера {container.name}: {e}",
+                    f"Ошибка при обработке контейнера {summary.get('Id', '?')[:12]}: {e}",
                     file=sys.stderr,
                 )
 
@@ -185,7 +312,87 @@ def update_docker_cache(config: Dict[str, Any]) -> None:
         cache_data["error"] = "Docker daemon не доступен"
         print("Ошибка: Docker daemon не доступен.", file=sys.stderr)
 
-    save_docker_cache(cache_data)  # Сохраняем обновленные данные в файл кэша
+    save_docker_cache(
+        cache_data, config.get("compact_cache")
+    )  # Сохраняем обновленные данные в файл кэша
+    return cache_data
+
+
+def apply_container_event(
+    client: "docker.DockerClient",
+    cache_data: Dict[str, Any],
+    event: Dict[str, Any],
+    image_tags: Dict[str, str],
+) -> bool:
+    """
+    Применяет одно событие Docker к кэшу.
+
+    image_tags дополняется, если контейнер создан из еще неизвестного образа.
+    Возвращает True, если кэш изменился и его нужно сохранить.
+    """
+
+    if event.get("Type", "container") != "container":
+        return False
+    action = (event.get("Action") or event.get("status") or "").split(":", 1)[0]
+    full_id = event.get("id") or event.get("Actor", {}).get("ID")
+    if not full_id:
+        return False
+    short_id = full_id[:12]  # Так же, как container.short_id
+    containers = cache_data.setdefault("containers", {})
+
+    if action in CONTAINER_REMOVE_EVENTS:
+        return containers.pop(short_id, None) is not None
+    if action not in CONTAINER_UPDATE_EVENTS:
+        return False
+    summaries = client.api.containers(all=True, filters={"id": full_id})
+    if not summaries:
+        return containers.pop(short_id, None) is not None  # Уже удален
+    summary = summaries[0]
+    if summary.get("ImageID") not in image_tags:
+        image_tags.update(get_image_tags(client))
+    containers[short_id] = build_container_info(summary, image_tags)
+    return True
+
+
+def watch_docker_events(config: Dict[str, Any]) -> None:
+    """
+    Долгоживущий режим обновления кэша.
+
+    Выполняет полную синхронизацию при запуске и после потери потока
+    событий, а между ними обновляет docker_cache.json по событиям
+    client.events() (create/start/die/destroy/rename и т.д.).
+    """
+
+    docker = load_docker()
+
+    while True:
+        try:
+            client = docker.from_env()  # Подключаемся к Docker Daemon
+            since = int(time.time())  # События с момента синхронизации не теряются
+            image_tags: Dict[str, str] = {}
+            cache_data = update_docker_cache(config, client, image_tags)
+            if cache_data.get("error"):
+                raise docker.errors.DockerException(cache_data["error"])
+            events = client.events(
+                decode=True, since=since, filters={"type": "container"}
+            )
+            try:
+                for event in events:
+                    if apply_container_event(client, cache_data, event, image_tags):
+                        cache_data["timestamp"] = time.time()
+                        cache_data["error"] = None
+                        save_docker_cache(cache_data, config.get("compact_cache"))
+            finally:
+                events.close()
+            print(
+                "Предупреждение: Поток событий Docker завершился, пересинхронизация.",
+                file=sys.stderr,
+            )
+        except KeyboardInterrupt:
+            return
+        except Exception as e:
+            print(f"Ошибка потока событий Docker: {e}", file=sys.stderr)
+        time.sleep(EVENTS_RETRY_DELAY)
 
 
 def is_cache_valid(config: Dict[str, Any], cache_data: Dict[str, Any]) -> bool:
@@ -214,7 +421,22 @@ def main() -> None:
     Загружает настройки, проверяет актуальность кэша и при необходимости обновляет его.
     """
 
+    parser = argparse.ArgumentParser(description="Обновление кэша Docker для lim")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Следить за событиями Docker и обновлять кэш по мере их поступления",
+    )
+    args = parser.parse_args()
+
     config = load_config()  # Загружаем настройки пользователя
+    if args.watch:
+        try:
+            watch_docker_events(config)
+        except KeyboardInterrupt:
+            pass
+        return
+
     cache_data = load_docker_cache()  # Загружаем данные из кэша
 
     if not is_cache_valid(config, cache_data):  # Проверяем актуальность кэша
@@ -6,23 +6,39 @@ import subprocess
 import re
 import os
 import glob
+import json
+import threading
+from pathlib import Path
+import profiler
 from utils import addstr_clipped, draw_box, draw_bar, format_bytes
 
+# RAM modules don't change while the machine runs: dmidecode is parsed once per
+# boot on a background thread and the result is kept in CONFIG_DIR keyed by
+# boot_id, so later launches show modules without spawning anything.
+DMI_CACHE_FILE = Path.home() / ".config/lim/dmidecode_cache.json"
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+DMI_PENDING = [{"Error": "Reading RAM modules (dmidecode)..."}]
+
+dmi_modules = None
+dmi_scan_thread = None
+dmi_lock = threading.Lock()
+
 
 def parse_dmidecode_memory():
     modules = []
     err_msg = None
     try:
-        sp = subprocess.run(["which", "dmidecode"], capture_output=True, check=False)
-        if sp.returncode != 0:
-            return [{"Error": "dmidecode not found (install it)"}]
-        result = subprocess.run(
-            ["dmidecode", "--type", "17"],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=2.0,
-        )
+        with profiler.timed("dmidecode"):
+            sp = subprocess.run(["which", "dmidecode"], capture_output=True, check=False)
+            if sp.returncode != 0:
+                return [{"Error": "dmidecode not found (install it)"}]
+            result = subprocess.run(
+                ["dmidecode", "--type", "17"],
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=2.0,
+            )
         if result.returncode != 0:
             stderr_line = (
                 result.stderr.strip().splitlines()[0]
@@ -91,7 +107,90 @@ def parse_dmidecode_memory():
         return modules
 
 
-def draw_memory_block_content(win, key_attr, value_attr, bar_colors):
+def get_boot_id():
+    try:
+        with open(BOOT_ID_PATH) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def load_dmidecode_cache(boot_id, path=None):
+    path = Path(path or DMI_CACHE_FILE)
+    if not boot_id:
+        return None
+    try:
+        with open(path, "r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("boot_id") != boot_id:
+        return None
+    modules = cached.get("modules")
+    return modules if isinstance(modules, list) and modules else None
+
+
+def save_dmidecode_cache(boot_id, modules, path=None):
+    # Errors (no dmidecode, no root) are not persisted: they may go away on
+    # the next launch, while a good parse stays valid until reboot.
+    path = Path(path or DMI_CACHE_FILE)
+    if not boot_id or not modules or "Error" in modules[0]:
+        return False
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump({"boot_id": boot_id, "modules": modules}, f)
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def _scan_dmidecode(boot_id):
+    global dmi_modules
+    modules = parse_dmidecode_memory()
+    with dmi_lock:
+        dmi_modules = modules
+    save_dmidecode_cache(boot_id, modules)
+
+
+def start_dmidecode_scan():
+    # Uses the per-boot cache when present, otherwise parses in the background.
+    global dmi_modules, dmi_scan_thread
+    with dmi_lock:
+        if dmi_modules is not None or dmi_scan_thread is not None:
+            return
+        boot_id = get_boot_id()
+        cached = load_dmidecode_cache(boot_id)
+        if cached is not None:
+            dmi_modules = cached
+            return
+        dmi_scan_thread = threading.Thread(
+            target=_scan_dmidecode, args=(boot_id,), name="lim-dmidecode", daemon=True
+        )
+        dmi_scan_thread.start()
+
+
+def get_memory_modules():
+    # The scan is started by the draw code once the modules table is on screen.
+    modules = dmi_modules
+    return modules if modules is not None else DMI_PENDING
+
+
+def collect_memory_data():
+    return {
+        "mem": psutil.virtual_memory(),
+        "swap": psutil.swap_memory(),
+        "modules": get_memory_modules(),
+    }
+
+
+def draw_memory_block_content(win, key_attr, value_attr, bar_colors, data=None):
     h, w = win.getmaxyx()
     draw_box(win, "Memory", key_attr)
     current_row = 1
@@ -100,8 +199,10 @@ def draw_memory_block_content(win, key_attr, value_attr, bar_colors):
     bar_width = max(0, w - 2 - 8)
 
     try:
-        mem = psutil.virtual_memory()
-        swap = psutil.swap_memory()
+        if data is None:
+            data = collect_memory_data()
+        mem = data["mem"]
+        swap = data["swap"]
         if current_row < h - 1:
             rp = mem.percent
             ruc = mem.total - mem.available
@@ -195,8 +296,9 @@ def draw_memory_block_content(win, key_attr, value_attr, bar_colors):
             current_row += 1
             addstr_clipped(win, current_row, 1, "RAM Modules (dmidecode):", key_attr)
             current_row += 1
+            start_dmidecode_scan()
 
-        phys_mem_info = parse_dmidecode_memory()
+        phys_mem_info = data["modules"]
 
         if phys_mem_info and current_row < h - 1:
             first_item = phys_mem_info[0]
@@ -2,7 +2,6 @@
 
 import curses
 import psutil
-import platform
 import socket
 import time
 import datetime
@@ -49,12 +48,78 @@ def get_cpu_model():
                     return line.split(":", 1)[1].strip()
     except Exception:
         pass
+    import platform  # only for hosts without a model name in /proc/cpuinfo
+
     proc = platform.processor()
     return proc if proc else "N/A"
 
 
+def _find_disk_partition():
+    partitions = psutil.disk_partitions(all=False)
+    root_part = next((p for p in partitions if p.mountpoint == "/"), None)
+    if root_part:
+        return root_part
+    relevant = [
+        p
+        for p in partitions
+        if p.fstype
+        and not p.mountpoint.startswith(("/boot", "/snap", "/var/lib/docker"))
+        and "loop" not in p.device
+    ]
+    return relevant[0] if relevant else None
+
+
+def collect_system_data():
+    # Slow-changing part of the panel: host identity, users and disk usage.
+    # The monitor samples it far less often than collect_activity_data().
+    # os.uname() gives the same fields as platform.uname() without importing platform,
+    # which is a noticeable part of the monitor's startup
+    uname = os.uname()
+    data = {
+        "hostname": uname.nodename,
+        "os_info": f"{uname.sysname} {uname.release}",
+        "cpu_model": get_cpu_model(),
+        "ip_addr": get_ip_address(),
+        "num_cores": psutil.cpu_count() or 1,
+        "users": None,
+        "disk": None,
+        "disk_error": None,
+    }
+    try:
+        data["users"] = ", ".join(sorted([u.name for u in psutil.users()]))
+    except Exception:
+        pass
+    try:
+        part = _find_disk_partition()
+        if part:
+            data["disk"] = (part, psutil.disk_usage(part.mountpoint))
+    except Exception as e:
+        data["disk_error"] = str(e)
+    return data
+
+
+def collect_activity_data():
+    data = {
+        "boot_time": psutil.boot_time(),
+        "load_avg": psutil.getloadavg(),
+        "net_io": None,
+        "net_error": None,
+    }
+    try:
+        data["net_io"] = psutil.net_io_counters()
+    except Exception as e:
+        data["net_error"] = str(e)
+    return data
+
+
+def collect_misc_data(system_data=None):
+    data = dict(system_data or collect_system_data())
+    data.update(collect_activity_data())
+    return data
+
+
 def draw_misc_block_content(
-    win, key_attr, value_attr, disk_high_attr, net_attr, load_colors
+    win, key_attr, value_attr, disk_high_attr, net_attr, load_colors, data=None
 ):
     h, w = win.getmaxyx()
     draw_box(win, "System Info", key_attr)
@@ -92,23 +157,19 @@ def draw_misc_block_content(
         return True
 
     try:
-        hostname = platform.node()
-        os_info = f"{platform.system()} {platform.release()}"
-        cpu_model = get_cpu_model()
-        ip_addr = get_ip_address()
+        if data is None:
+            data = collect_misc_data()
+        hostname = data["hostname"]
+        os_info = data["os_info"]
+        cpu_model = data["cpu_model"]
+        ip_addr = data["ip_addr"]
         now_str = datetime.datetime.now().strftime("%H:%M:%S")
-        uptime_seconds = time.time() - psutil.boot_time()
+        uptime_seconds = time.time() - data["boot_time"]
         uptime_str = format_uptime(uptime_seconds)
-        load_avg = psutil.getloadavg()
+        load_avg = data["load_avg"]
         load_str = f"{load_avg[0]:.2f} {load_avg[1]:.2f} {load_avg[2]:.2f}"
-        users_list = []
-        user_str = "N/A"
-        try:
-            users_list = psutil.users()
-            user_str = ", ".join(sorted([u.name for u in users_list]))
-        except Exception:
-            pass
-        num_cores = psutil.cpu_count() or 1
+        user_str = data["users"] if data["users"] is not None else "N/A"
+        num_cores = data["num_cores"]
         load_1min_per_core = load_avg[0] / num_cores
         load_attr = curses.color_pair(load_colors["low"]) | curses.A_BOLD
         if load_1min_per_core > LOAD_AVG_THRESHOLDS["high"]:
@@ -164,24 +225,12 @@ def draw_misc_block_content(
             disk_info_str = " N/A"
             disk_info_attr = value_attr | curses.A_DIM
             try:
-                partitions = psutil.disk_partitions(all=False)
-                root_part = next((p for p in partitions if p.mountpoint == "/"), None)
-                part_to_show = root_part
-                if not part_to_show:
-                    relevant = [
-                        p
-                        for p in partitions
-                        if p.fstype
-                        and not p.mountpoint.startswith(
-                            ("/boot", "/snap", "/var/lib/docker")
-                        )
-                        and "loop" not in p.device
-                    ]
-                    if relevant:
-                        part_to_show = relevant[0]
+                if data["disk_error"]:
+                    raise OSError(data["disk_error"])
+                part_to_show = data["disk"][0] if data["disk"] else None
                 if part_to_show:
                     p = part_to_show
-                    usage = psutil.disk_usage(p.mountpoint)
+                    usage = data["disk"][1]
                     used_h = format_bytes(usage.used)
                     total_h = format_bytes(usage.total)
                     perc = usage.percent
@@ -204,7 +253,9 @@ def draw_misc_block_content(
             net_info_str = " N/A"
             net_info_attr = value_attr | curses.A_DIM
             try:
-                net_io = psutil.net_io_counters()
+                if data["net_error"]:
+                    raise OSError(data["net_error"])
+                net_io = data["net_io"]
                 if net_io:
                     sent = format_bytes(net_io.bytes_sent)
                     recv = format_bytes(net_io.bytes_recv)
@@ -4,7 +4,6 @@ import psutil
 import os
 import time
 import re
-import platform
 import subprocess
 import sys
 from math import floor
@@ -12,6 +11,12 @@ from utils import addstr_clipped, draw_box, bytes_to_mb_f, addstr_colored_markup
 import datetime
 from pathlib import Path
 import json
+import pwd
+import heapq
+import struct
+from array import array
+import operator
+import profiler
 
 DEBUG_DOCKER = False
 DEBUG_LOG_FILE = "/tmp/py_monitor_debug.log"
@@ -30,17 +35,48 @@ def debug_print(*args, **kwargs):
                 pass
 
 
-PREV_STATE_FILE = f"/tmp/py_monitor_prev_rss.{os.getuid()}.tsv"
+# sys.platform instead of platform.system(): importing platform is a measurable
+# share of the monitor's startup
+IS_LINUX = sys.platform.startswith("linux")
+
+RSS_STATE_FILE = f"/tmp/py_monitor_rss_history.{os.getuid()}.bin"
+RSS_STATE_PERSIST = os.environ.get("LIM_RSS_PERSIST", "1") != "0"
+RSS_STATE_MAGIC = b"LIMR"
+RSS_STATE_HEADER = struct.Struct("<4sHI")
+RSS_STATE_ENTRY = struct.Struct("<IdH")
+RSS_STATE_SAMPLE = struct.Struct("<dd")
+RSS_HISTORY_SAMPLES = 16
 MEM_THRESHOLD_HIGH = 1000
 MEM_THRESHOLD_MED = 300
 MEM_THRESHOLD_LOW = 100
 CPU_THRESHOLD_HIGH = 80.0
 DOCKER_CACHE_FILE = Path.home() / ".config/lim/docker_cache.json"
 DOCKER_CACHE_REFRESH_INTERVAL = 10
-prev_rss_cache = {}
-last_read_time = 0
+rss_history = {}
+rss_history_loaded = not RSS_STATE_PERSIST
 container_id_to_name_cache = {}
 last_cache_read_time = 0
+# (st_mtime_ns, st_size, st_ino) of the docker cache file last parsed
+docker_cache_file_key = None
+process_identity_cache = {}
+TOP_K_MAX_FRACTION = 2
+PROCESS_ENGINE = os.environ.get("LIM_PROCESS_ENGINE", "psutil")
+PROC_ROOT = "/proc"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+PROCESS_ATTRS = [
+    "pid",
+    "name",
+    "create_time",
+    "cpu_percent",
+    "memory_info",
+    "memory_percent",
+]
+# pid -> (start_ticks, cpu_ticks, monotonic time of the reading)
+procfs_prev_cpu_ticks = {}
+psutil_process_cache = {}
+procfs_boot_time = None
+uid_to_username_cache = {}
 PROCESS_NAME_MAP = {
     "apache2": "Apache2 HTTPD",
     "httpd": "HTTPD",
@@ -769,66 +805,283 @@ PROCESS_NAME_MAP = {
 }
 
 
-def read_prev_rss_state():
-    global prev_rss_cache, last_read_time
-    now = time.time()
-    if not prev_rss_cache or now - last_read_time > 5:
-        prev_rss_cache = {}
-        if os.path.exists(PREV_STATE_FILE):
-            try:
-                with open(PREV_STATE_FILE, "r") as f:
-                    for line in f:
-                        parts = line.strip().split("\t")
-                        if len(parts) == 2:
-                            prev_rss_cache[parts[0]] = parts[1]
-                last_read_time = now
-            except Exception:
-                pass
-    return prev_rss_cache
+class RssRing:
+    # Last RSS_HISTORY_SAMPLES (timestamp, rss_mb) samples of one process.
+    __slots__ = ("create_time", "times", "values", "pos", "count")
+
+    def __init__(self, create_time, size=None):
+        size = size or RSS_HISTORY_SAMPLES
+        self.create_time = create_time
+        self.times = array("d", bytes(8 * size))
+        self.values = array("d", bytes(8 * size))
+        self.pos = 0
+        self.count = 0
+
+    def push(self, timestamp, rss_mb):
+        self.times[self.pos] = timestamp
+        self.values[self.pos] = rss_mb
+        self.pos = (self.pos + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+
+    def latest(self, before=None):
+        # Newest value, skipping samples taken at `before` (the frame being
+        # redrawn) so repeated draws of one snapshot compare to the previous.
+        size = len(self.values)
+        for i in range(1, self.count + 1):
+            idx = (self.pos - i) % size
+            if before is None or self.times[idx] != before:
+                return self.values[idx]
+        return None
+
+    def samples(self):
+        size = len(self.values)
+        start = (self.pos - self.count) % size
+        return [
+            (self.times[(start + i) % size], self.values[(start + i) % size])
+            for i in range(self.count)
+        ]
+
 
+def record_rss_sample(pid, create_time, rss_mb, timestamp=None):
+    timestamp = timestamp if timestamp is not None else time.time()
+    ring = rss_history.get(pid)
+    if ring is None or ring.create_time != create_time:
+        ring = RssRing(create_time)
+        rss_history[pid] = ring
+    elif ring.count and ring.times[ring.pos - 1] == timestamp:
+        return ring
+    ring.push(timestamp, rss_mb)
+    return ring
 
-def save_current_rss_state(current_rss):
+
+def get_rss_marker(pid, create_time, rss_mb, sample_time=None):
+    # "+" new or grown, "-" shrunk, "" unchanged since the last recorded frame.
+    ring = rss_history.get(pid)
+    prev = None
+    if ring is not None and ring.create_time == create_time:
+        prev = ring.latest(before=sample_time)
+    if prev is None:
+        return "+"
+    rss_r = round(rss_mb, 1)
+    prev_r = round(prev, 1)
+    if rss_r > prev_r:
+        return "+"
+    if rss_r < prev_r:
+        return "-"
+    return ""
+
+
+def get_rss_growth_rate(pid):
+    # MB per second between the oldest and newest recorded samples.
+    ring = rss_history.get(pid)
+    if ring is None or ring.count < 2:
+        return None
+    samples = ring.samples()
+    (t0, v0), (t1, v1) = samples[0], samples[-1]
+    if t1 <= t0:
+        return None
+    return (v1 - v0) / (t1 - t0)
+
+
+def prune_rss_history(seen_pids):
+    for pid in [p for p in list(rss_history) if p not in seen_pids]:
+        rss_history.pop(pid, None)
+
+
+def load_rss_history(path=None):
+    # Binary layout: magic, sample slots, entry count, then per entry
+    # pid, create_time, sample count and (timestamp, rss_mb) pairs.
+    global rss_history_loaded
+    rss_history_loaded = True
+    path = path or RSS_STATE_FILE
     try:
-        temp_new_state = f"{PREV_STATE_FILE}.new"
-        with open(temp_new_state, "w") as f:
-            for pid, rss in current_rss.items():
-                f.write(f"{str(pid)}\t{str(rss)}\n")
-        os.replace(temp_new_state, PREV_STATE_FILE)
-        os.chmod(PREV_STATE_FILE, 0o600)
-    except Exception:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, size, entries = RSS_STATE_HEADER.unpack_from(data, 0)
+        if magic != RSS_STATE_MAGIC:
+            return
+        offset = RSS_STATE_HEADER.size
+        for _ in range(entries):
+            pid, create_time, count = RSS_STATE_ENTRY.unpack_from(data, offset)
+            offset += RSS_STATE_ENTRY.size
+            ring = RssRing(create_time)
+            for _ in range(count):
+                timestamp, rss_mb = RSS_STATE_SAMPLE.unpack_from(data, offset)
+                offset += RSS_STATE_SAMPLE.size
+                ring.push(timestamp, rss_mb)
+            rss_history.setdefault(pid, ring)
+    except (OSError, struct.error) as e:
+        debug_print(f"load_rss_history: {e}")
+
+
+def save_rss_history(path=None):
+    if not RSS_STATE_PERSIST:
+        return
+    path = path or RSS_STATE_FILE
+    try:
+        header = RSS_STATE_HEADER.pack(
+            RSS_STATE_MAGIC, RSS_HISTORY_SAMPLES, len(rss_history)
+        )
+        chunks = [header]
+        for pid, ring in rss_history.items():
+            samples = ring.samples()
+            chunks.append(
+                RSS_STATE_ENTRY.pack(pid, ring.create_time or 0.0, len(samples))
+            )
+            for timestamp, rss_mb in samples:
+                chunks.append(RSS_STATE_SAMPLE.pack(timestamp, rss_mb))
+        temp_path = f"{path}.new"
+        with open(temp_path, "wb") as f:
+            f.write(b"".join(chunks))
+        os.chmod(temp_path, 0o600)
+        os.replace(temp_path, path)
+    except OSError as e:
+        debug_print(f"save_rss_history: {e}")
+
+
+CGROUP_CONTAINER_PATTERN = re.compile(
+    r"(?:docker-|/docker/|docker-|kubepods.*/pod[^/]+/)([0-9a-f]{64})"
+)
+CGROUP_CACHE_MAX_ENTRIES = 4096
+cgroup_to_container_id_cache = {}
+pid_container_index = {}
+
+
+def container_id_from_cgroup_content(cgroup_content):
+    # Every process of a container shares the same cgroup text, so the regex
+    # runs once per distinct cgroup rather than once per process.
+    try:
+        return cgroup_to_container_id_cache[cgroup_content]
+    except KeyError:
         pass
+    match = CGROUP_CONTAINER_PATTERN.search(cgroup_content)
+    full_id = match.group(1) if match else None
+    if len(cgroup_to_container_id_cache) >= CGROUP_CACHE_MAX_ENTRIES:
+        cgroup_to_container_id_cache.clear()
+    cgroup_to_container_id_cache[cgroup_content] = full_id
+    return full_id
 
 
 def get_container_id_from_cgroup(pid):
-    if platform.system() != "Linux":
+    if not IS_LINUX:
         return None
+    started = time.perf_counter()
     try:
-        pattern = re.compile(
-            r"(?:docker-|/docker/|docker-|kubepods.*/pod[^/]+/)([0-9a-f]{64})"
-        )
-        cgroup_path = f"/proc/{pid}/cgroup"
-        if not os.path.exists(cgroup_path):
-            return None
-        with open(cgroup_path, "r") as f:
+        with open(f"{PROC_ROOT}/{pid}/cgroup", "r") as f:
             cgroup_content = f.read()
-        match = pattern.search(cgroup_content)
-        full_id = match.group(1) if match else None
-        return full_id
+        profiler.accumulate("cgroup reads", time.perf_counter() - started)
+        return container_id_from_cgroup_content(cgroup_content)
+    except OSError:
+        return None
     except Exception as e:
         debug_print(f"get_container_id_from_cgroup({pid}): ERROR: {e}")
         return None
 
+
+def resolve_container_id(pid, create_time=None):
+    # A PID's cgroup is only read when the PID is new or was reused (its
+    # create_time changed).
+    entry = pid_container_index.get(pid)
+    if entry is not None and (create_time is None or entry[0] == create_time):
+        return entry[1]
+    container_id = get_container_id_from_cgroup(pid)
+    pid_container_index[pid] = (create_time, container_id)
+    return container_id
+
+
+def prune_container_index(seen_pids):
+    for pid in [p for p in pid_container_index if p not in seen_pids]:
+        del pid_container_index[pid]
+
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+CONTAINER_CGROUP_DIR_TEMPLATES = [
+    "{root}/system.slice/docker-{id}.scope",
+    "{root}/docker/{id}",
+    "{root}/pids/system.slice/docker-{id}.scope",
+    "{root}/pids/docker/{id}",
+    "{root}/memory/system.slice/docker-{id}.scope",
+    "{root}/memory/docker/{id}",
+    "{root}/systemd/system.slice/docker-{id}.scope",
+    "{root}/systemd/docker/{id}",
+]
+container_cgroup_dir_cache = {}
+
+
+def _find_container_cgroup_dir(container_id):
+    # Stopped containers have no cgroup; the miss is remembered until the
+    # Docker cache is next refreshed.
+    cached = container_cgroup_dir_cache.get(container_id)
+    if cached is not None:
+        path, checked_at = cached
+        if path or time.time() - checked_at < DOCKER_CACHE_REFRESH_INTERVAL:
+            return path
+    path = None
+    for template in CONTAINER_CGROUP_DIR_TEMPLATES:
+        candidate = template.format(root=CGROUP_ROOT, id=container_id)
+        if os.path.isfile(candidate + "/cgroup.procs"):
+            path = candidate
+            break
+    container_cgroup_dir_cache[container_id] = (path, time.time())
+    return path
+
+
+def _read_cgroup_procs(cgroup_dir):
+    with open(cgroup_dir + "/cgroup.procs", "rb") as f:
+        return [int(line) for line in f.read().split()]
+
+
+def list_docker_pids():
+    # Returns {pid: container_id} for every container known to the Docker
+    # cache, read from each container's cgroup.procs, or None when no
+    # container cgroup can be located (non-Linux, unknown cgroup layout).
+    if not IS_LINUX:
+        return None
+    pid_to_container = {}
+    found_any = False
+    for container_id in list(container_id_to_name_cache):
+        cgroup_dir = _find_container_cgroup_dir(container_id)
+        if not cgroup_dir:
+            continue
+        try:
+            pids = _read_cgroup_procs(cgroup_dir)
+        except (OSError, ValueError):
+            container_cgroup_dir_cache.pop(container_id, None)
+            continue
+        found_any = True
+        for pid in pids:
+            pid_to_container[pid] = container_id
+    stale = [
+        c for c in container_cgroup_dir_cache if c not in container_id_to_name_cache
+    ]
+    for container_id in stale:
+        del container_cgroup_dir_cache[container_id]
+    return pid_to_container if found_any else None
+
+
+def _docker_cache_file_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
 def _refresh_docker_cache():
-    global container_id_to_name_cache, last_cache_read_time
+    global container_id_to_name_cache, last_cache_read_time, docker_cache_file_key
     now = time.time()
     if now - last_cache_read_time < DOCKER_CACHE_REFRESH_INTERVAL:
         return
+    file_key = _docker_cache_file_key(DOCKER_CACHE_FILE)
+    if file_key is not None and file_key == docker_cache_file_key:
+        last_cache_read_time = now
+        return
 
     debug_print(f"Refreshing Docker cache from JSON: {DOCKER_CACHE_FILE}...")
     new_cache = {}
     
     try:
-        if DOCKER_CACHE_FILE.is_file():
+        if file_key is not None:
             with open(DOCKER_CACHE_FILE, "r", encoding='utf-8') as f:
                 data = json.load(f)
             
@@ -840,16 +1093,18 @@ def _refresh_docker_cache():
                     new_cache[full_id] = name
             
             container_id_to_name_cache = new_cache
+            docker_cache_file_key = file_key
             last_cache_read_time = now
             debug_print(f"  JSON Cache refreshed. New size: {len(container_id_to_name_cache)}")
         else:
             debug_print(f"  Cache file {DOCKER_CACHE_FILE} not found.")
             container_id_to_name_cache.clear()
+            docker_cache_file_key = None
             last_cache_read_time = now
 
     except (json.JSONDecodeError, OSError) as e:
+        # Keep the last good names; the file is retried on the next interval.
         debug_print(f"  Cache refresh FAILED: {e}")
-        container_id_to_name_cache.clear() 
         last_cache_read_time = now
     except Exception as e:
         debug_print(f"  Unexpected cache refresh FAILED: {e}")
@@ -857,29 +1112,31 @@ def _refresh_docker_cache():
         last_cache_read_time = now
 
 
-def get_docker_info(pid):
+def get_docker_name(container_id_full):
     global container_id_to_name_cache
-    container_id_full = get_container_id_from_cgroup(pid)
     if not container_id_full:
         return None
     needs_refresh = container_id_full not in container_id_to_name_cache
     if needs_refresh:
         debug_print(
-            f"get_docker_info({pid}): ID {container_id_full[:12]}... not in cache. Refreshing."
+            f"get_docker_name: ID {container_id_full[:12]}... not in cache. Refreshing."
         )
         _refresh_docker_cache()
     cached_name = container_id_to_name_cache.get(container_id_full)
     if cached_name:
-        debug_print(f"get_docker_info({pid}): Found name in cache: '{cached_name}'")
         return cached_name
     else:
         short_id = container_id_full[:12]
         debug_print(
-            f"get_docker_info({pid}): Name for ID {short_id}... NOT found. Returning short ID."
+            f"get_docker_name: Name for ID {short_id}... NOT found. Returning short ID."
         )
         return short_id
 
 
+def get_docker_info(pid):
+    return get_docker_name(resolve_container_id(pid))
+
+
 def get_display_name(pinfo):
     name = pinfo.get("name")
     cmdline = pinfo.get("cmdline") or []
@@ -934,59 +1191,335 @@ def get_display_name(pinfo):
     return display_name if display_name else "N/A"
 
 
-def get_processes(sort_key):
+def _read_procfs_cmdline(pid):
+    try:
+        with open(f"{PROC_ROOT}/{pid}/cmdline", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    args = data.decode("utf-8", "replace").split("\0")
+    if args and args[-1] == "":
+        args.pop()
+    return args
+
+
+def _username_for_uid(uid):
+    username = uid_to_username_cache.get(uid)
+    if username is None:
+        try:
+            username = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            username = str(uid)
+        uid_to_username_cache[uid] = username
+    return username
+
+
+def _read_procfs_username(pid):
+    # The real UID, first field of "Uid:" in /proc/[pid]/status, as psutil's
+    # username() reports it. The owner of /proc/[pid] is the effective UID and
+    # turns into root for non-dumpable processes (setuid programs, sshd).
+    try:
+        data = _read_procfs_file(f"{PROC_ROOT}/{pid}/status")
+    except OSError:
+        return None
+    start = data.find(b"\nUid:")
+    if start < 0:
+        return None
+    return _username_for_uid(int(data[start + 5 :].split(None, 1)[0]))
+
+
+def get_process_identity(proc, pinfo):
+    # cmdline, username, display name and container ID only change when a PID
+    # is reused (new create_time) or the process exec's (new name), so they are
+    # resolved once per (pid, create_time) instead of on every frame.
+    # proc is None for rows collected by the procfs engine.
+    pid = pinfo["pid"]
+    create_time = pinfo.get("create_time")
+    name = pinfo.get("name")
+    identity = process_identity_cache.get(pid)
+    if (
+        identity is not None
+        and identity["create_time"] == create_time
+        and identity["name"] == name
+    ):
+        return identity
+    if proc is None:
+        cmdline = _read_procfs_cmdline(pid)
+        username = _read_procfs_username(pid)
+    else:
+        try:
+            cmdline = proc.cmdline()
+        except (psutil.AccessDenied, psutil.ZombieProcess):
+            cmdline = None
+        try:
+            username = proc.username()
+        except (psutil.AccessDenied, psutil.ZombieProcess, KeyError):
+            username = None
+    identity = {
+        "create_time": create_time,
+        "name": name,
+        "cmdline": cmdline,
+        "username": username,
+        "container_id": resolve_container_id(pid, create_time),
+    }
+    identity["display_name"] = get_display_name(identity)
+    process_identity_cache[pid] = identity
+    return identity
+
+
+def prune_process_identity_cache(seen_pids):
+    for pid in [p for p in process_identity_cache if p not in seen_pids]:
+        del process_identity_cache[pid]
+    prune_container_index(seen_pids)
+
+
+def _is_hidden_process(name):
+    return name == "idle" or "kernel_task" in name
+
+
+def _finish_pinfo(pinfo, identity):
+    pinfo["username"] = identity["username"]
+    pinfo["cmdline"] = identity["cmdline"]
+    pinfo["display_name"] = identity["display_name"]
+    pinfo["docker_info"] = get_docker_name(identity["container_id"])
+    return pinfo
+
+
+def _pinfo_from_psutil(proc, pinfo):
+    if (
+        pinfo["pid"] is None
+        or pinfo["name"] is None
+        or pinfo["memory_info"] is None
+        or _is_hidden_process(pinfo["name"])
+    ):
+        return None
+    identity = get_process_identity(proc, pinfo)
+    if identity["username"] is None:
+        return None
+    mem_info = pinfo.get("memory_info")
+    pinfo["rss_mb"] = (
+        bytes_to_mb_f(mem_info.rss) if mem_info and mem_info.rss is not None else 0.0
+    )
+    pinfo["vms_mb"] = (
+        bytes_to_mb_f(mem_info.vms) if mem_info and mem_info.vms is not None else 0.0
+    )
+    pinfo["cpu_percent"] = pinfo.get("cpu_percent")
+    if pinfo["cpu_percent"] is None:
+        try:
+            pinfo["cpu_percent"] = proc.cpu_percent(interval=None) or 0.0
+        except Exception:
+            pinfo["cpu_percent"] = 0.0
+    if pinfo["cpu_percent"] is None:
+        pinfo["cpu_percent"] = 0.0
+    pinfo["memory_percent"] = pinfo.get("memory_percent") or 0.0
+    return _finish_pinfo(pinfo, identity)
+
+
+def _collect_psutil(seen_pids, pids=None):
     processes = []
-    attrs = [
-        "pid",
-        "name",
-        "username",
-        "cpu_percent",
-        "memory_info",
-        "memory_percent",
-        "cmdline",
-    ]
-    _refresh_docker_cache()
-    for proc in psutil.process_iter(attrs=attrs, ad_value=None):
+    if pids is None:
+        procs = psutil.process_iter(attrs=PROCESS_ATTRS, ad_value=None)
+    else:
+        procs = _psutil_processes_for(pids)
+    for proc in procs:
         try:
-            pinfo = proc.info
-            if (
-                pinfo["pid"] is None
-                or pinfo["name"] is None
-                or pinfo["username"] is None
-                or pinfo["memory_info"] is None
-                or pinfo["name"] == "idle"
-                or "kernel_task" in pinfo["name"]
-            ):
-                continue
-            mem_info = pinfo.get("memory_info")
-            pinfo["rss_mb"] = (
-                bytes_to_mb_f(mem_info.rss)
-                if mem_info and mem_info.rss is not None
-                else 0.0
-            )
-            pinfo["vms_mb"] = (
-                bytes_to_mb_f(mem_info.vms)
-                if mem_info and mem_info.vms is not None
-                else 0.0
-            )
-            pinfo["cpu_percent"] = pinfo.get("cpu_percent")
-            if pinfo["cpu_percent"] is None:
-                try:
-                    pinfo["cpu_percent"] = proc.cpu_percent(interval=None) or 0.0
-                except Exception:
-                    pinfo["cpu_percent"] = 0.0
-            if pinfo["cpu_percent"] is None:
-                pinfo["cpu_percent"] = 0.0
-            pinfo["memory_percent"] = pinfo.get("memory_percent") or 0.0
-            if pinfo["memory_percent"] is None:
-                pinfo["memory_percent"] = 0.0
-            pinfo["display_name"] = get_display_name(pinfo)
-            pinfo["docker_info"] = get_docker_info(pinfo["pid"])
-            processes.append(pinfo)
+            if pids is not None:
+                proc.info = proc.as_dict(attrs=PROCESS_ATTRS, ad_value=None)
+            pid = proc.info["pid"]
+            if pid is not None:
+                seen_pids.add(pid)
+            pinfo = _pinfo_from_psutil(proc, proc.info)
+            if pinfo is not None:
+                processes.append(pinfo)
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             continue
         except Exception:
             continue
+    return processes
+
+
+def _psutil_processes_for(pids):
+    # process_iter keeps Process objects alive between calls so cpu_percent
+    # has a previous sample; do the same for explicit PID lists.
+    wanted = set(pids)
+    for pid in [p for p in psutil_process_cache if p not in wanted]:
+        del psutil_process_cache[pid]
+    procs = []
+    for pid in wanted:
+        proc = psutil_process_cache.get(pid)
+        try:
+            if proc is None or not proc.is_running():
+                proc = psutil.Process(pid)
+                psutil_process_cache[pid] = proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            psutil_process_cache.pop(pid, None)
+            continue
+        procs.append(proc)
+    return procs
+
+
+def _collect_psutil_single(pid):
+    try:
+        proc = psutil.Process(pid)
+        return _pinfo_from_psutil(
+            proc, proc.as_dict(attrs=PROCESS_ATTRS, ad_value=None)
+        )
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+    except Exception:
+        return None
+
+
+def _read_procfs_file(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096)
+    finally:
+        os.close(fd)
+
+
+def parse_procfs_stat(data):
+    # /proc/[pid]/stat: "pid (comm) state ppid ...". comm may contain spaces
+    # and parentheses, so split on the last ")".
+    lparen = data.index(b"(")
+    rparen = data.rindex(b")")
+    name = data[lparen + 1 : rparen].decode("utf-8", "replace")
+    fields = data[rparen + 2 :].split()
+    utime = int(fields[11])
+    stime = int(fields[12])
+    start_ticks = int(fields[19])
+    return name, utime + stime, start_ticks
+
+
+def _procfs_available():
+    return IS_LINUX and os.path.isdir(f"{PROC_ROOT}/self")
+
+
+def _iter_procfs_pids():
+    with os.scandir(PROC_ROOT) as it:
+        for entry in it:
+            if entry.name.isdigit():
+                yield int(entry.name)
+
+
+def _collect_procfs(seen_pids, pids=None):
+    # A PID subset (docker mode) updates only its own CPU baselines; each
+    # baseline keeps its own timestamp, so PIDs skipped by a subset scan still
+    # get a correct percentage on the next full scan.
+    global procfs_boot_time
+    if procfs_boot_time is None:
+        procfs_boot_time = psutil.boot_time()
+    now = time.monotonic()
+    total_mem = psutil.virtual_memory().total or 1
+    processes = []
+    scanned_pids = set()
+    for pid in _iter_procfs_pids() if pids is None else pids:
+        path = f"{PROC_ROOT}/{pid}"
+        try:
+            stat_data = _read_procfs_file(path + "/stat")
+            statm_data = _read_procfs_file(path + "/statm")
+        except OSError:
+            continue
+        seen_pids.add(pid)
+        try:
+            proc_name, cpu_ticks, start_ticks = parse_procfs_stat(stat_data)
+            statm = statm_data.split()
+            vms = int(statm[0]) * PAGE_SIZE
+            rss = int(statm[1]) * PAGE_SIZE
+        except (ValueError, IndexError):
+            pinfo = _collect_psutil_single(pid)
+            if pinfo is not None:
+                processes.append(pinfo)
+            continue
+        if _is_hidden_process(proc_name):
+            continue
+        prev = procfs_prev_cpu_ticks.get(pid)
+        procfs_prev_cpu_ticks[pid] = (start_ticks, cpu_ticks, now)
+        scanned_pids.add(pid)
+        cpu_percent = 0.0
+        if prev is not None and prev[0] == start_ticks and now > prev[2]:
+            cpu_percent = (
+                max(0, cpu_ticks - prev[1]) * 100.0 / (CLOCK_TICKS * (now - prev[2]))
+            )
+        pinfo = {
+            "pid": pid,
+            "name": proc_name,
+            "create_time": procfs_boot_time + start_ticks / CLOCK_TICKS,
+            "cpu_percent": cpu_percent,
+            "memory_percent": rss * 100.0 / total_mem,
+            "rss_mb": bytes_to_mb_f(rss),
+            "vms_mb": bytes_to_mb_f(vms),
+        }
+        identity = get_process_identity(None, pinfo)
+        if identity["username"] is None:
+            continue
+        processes.append(_finish_pinfo(pinfo, identity))
+    if pids is None:
+        for pid in [p for p in procfs_prev_cpu_ticks if p not in scanned_pids]:
+            del procfs_prev_cpu_ticks[pid]
+    return processes
+
+
+def collect_processes(engine=None):
+    engine = engine or PROCESS_ENGINE
+    seen_pids = set()
+    _refresh_docker_cache()
+    processes = None
+    if engine == "procfs" and _procfs_available():
+        try:
+            processes = _collect_procfs(seen_pids)
+        except OSError as e:
+            debug_print(f"procfs engine failed, falling back to psutil: {e}")
+            seen_pids.clear()
+    if processes is None:
+        processes = _collect_psutil(seen_pids)
+    prune_process_identity_cache(seen_pids)
+    prune_rss_history(seen_pids)
+    return processes
+
+
+def collect_docker_processes(engine=None):
+    # Docker mode only needs container processes: take their PIDs from the
+    # containers' cgroup.procs instead of scanning the whole host. Identity
+    # caches are not pruned here, the next full scan does that.
+    engine = engine or PROCESS_ENGINE
+    _refresh_docker_cache()
+    started = time.perf_counter()
+    pid_to_container = list_docker_pids()
+    profiler.accumulate("cgroup reads", time.perf_counter() - started)
+    if pid_to_container is None:
+        return [p for p in collect_processes(engine) if p.get("docker_info")]
+    seen_pids = set()
+    processes = None
+    if engine == "procfs" and _procfs_available():
+        try:
+            processes = _collect_procfs(seen_pids, pid_to_container)
+        except OSError as e:
+            debug_print(f"procfs engine failed, falling back to psutil: {e}")
+            seen_pids.clear()
+    if processes is None:
+        processes = _collect_psutil(seen_pids, pid_to_container)
+    for pinfo in processes:
+        if not pinfo.get("docker_info"):
+            container_id = pid_to_container.get(pinfo["pid"])
+            pinfo["docker_info"] = get_docker_name(container_id)
+    return processes
+
+
+def get_processes(sort_key, engine=None, docker_only=False, limit=None):
+    if docker_only:
+        processes = collect_docker_processes(engine)
+    else:
+        processes = collect_processes(engine)
+    return sort_processes(processes, sort_key, limit)
+
+
+def sort_processes(processes, sort_key, limit=None):
+    # Returns a new list; the input (e.g. a sampler snapshot) is not touched.
+    # With limit, only the first `limit` rows (the visible window) are put in
+    # order; the remaining rows follow unsorted so the total count is kept.
+    # Name sorts and deep windows still get a full sort.
+    processes = list(processes)
     sort_keys = {
         "cpu": "cpu_percent",
         "pid": "pid",
@@ -1010,6 +1543,21 @@ def get_processes(sort_key):
             except (ValueError, TypeError):
                 return 0
 
+    if sort_field != "display_name":
+        field_key = operator.itemgetter(sort_field)
+        if limit is not None and limit * TOP_K_MAX_FRACTION < len(processes):
+            select = heapq.nlargest if is_reversed else heapq.nsmallest
+            try:
+                top = select(max(0, limit), processes, key=field_key)
+            except (TypeError, KeyError):
+                top = select(max(0, limit), processes, key=sort_key_func)
+            top_ids = {id(p) for p in top}
+            return top + [p for p in processes if id(p) not in top_ids]
+        try:
+            processes.sort(key=field_key, reverse=is_reversed)
+            return processes
+        except (TypeError, KeyError):
+            pass
     try:
         processes.sort(key=sort_key_func, reverse=is_reversed)
     except Exception as e:
@@ -1034,6 +1582,7 @@ def draw_process_block_content(
     docker_container_attr=0,
     killer_attr=0,
     is_selecting=False,
+    sample_time=None,
 ):
     try:
         if not win:
@@ -1092,10 +1641,10 @@ def draw_process_block_content(
             )
         procs_drawn_count = 0
         processes_to_draw = (
-            process_list if process_list is not None else get_processes(sort_key)
+            process_list
+            if process_list is not None
+            else get_processes(sort_key, docker_only=is_docker_mode)
         )
-        if is_docker_mode and process_list is None:
-            processes_to_draw = [p for p in processes_to_draw if p.get("docker_info")]
         header_y = 1
         content_y_start = 2
         max_content_rows = h - 1 - content_y_start
@@ -1110,6 +1659,7 @@ def draw_process_block_content(
         col_cpu = 6
         col_mem = 6
         col_rss = 9
+        col_rss_rate = 9
         col_user = 10
         col_vms = 9
         spacing = 1
@@ -1171,22 +1721,25 @@ def draw_process_block_content(
                         col_cpu,
                         col_mem,
                         col_rss,
+                        col_rss_rate,
                         col_vms,
                         col_container_norm,
                     ]
                 )
-                + (6 * spacing)
+                + (7 * spacing)
             )
             proc_cmd_real_width = max(1, w - 1 - fixed_width_before_last)
             header = (
                 f"{'PID':<{col_pid}}{' ' * spacing}{'USER':<{col_user}}{' ' * spacing}"
                 f"{'%CPU':>{col_cpu}}{' ' * spacing}{'%MEM':>{col_mem}}{' ' * spacing}"
-                f"{'RSS(MB)':>{col_rss}}{' ' * spacing}{'VMS(MB)':>{col_vms}}{' ' * spacing}"
-                f"{'CONTAINER':<{col_container_norm}}{' ' * spacing}{'NAME/INFO':<{proc_cmd_real_width}}"
+                f"{'RSS(MB)':>{col_rss}}{' ' * spacing}{'RSS MB/s':>{col_rss_rate}}{' ' * spacing}"
+                f"{'VMS(MB)':>{col_vms}}{' ' * spacing}{'CONTAINER':<{col_container_norm}}{' ' * spacing}{'NAME/INFO':<{proc_cmd_real_width}}"
             )
         addstr_clipped(win, header_y, 1, header, header_attr)
-        prev_rss = read_prev_rss_state()
-        current_rss_to_save = {}
+        if not rss_history_loaded:
+            load_rss_history()
+        if sample_time is None:
+            sample_time = time.time()
         for y in range(content_y_start, h - 1):
             win.move(y, 1)
             win.clrtoeol()
@@ -1207,25 +1760,15 @@ def draw_process_block_content(
             display_name = p.get("display_name", "N/A")
             docker_info = p.get("docker_info", "") or ""
             user = p.get("username", "N/A")
-            highlight_char = ""
-            prev_rss_val_str = prev_rss.get(pid_s)
-            if prev_rss_val_str is not None:
-                if prev_rss_val_str != rss_mb_s:
-                    try:
-                        rss_f = float(rss_mb_s)
-                        prev_rss_f = float(prev_rss_val_str)
-                        if rss_f > prev_rss_f:
-                            highlight_char = "+"
-                        elif rss_f < prev_rss_f:
-                            highlight_char = "-"
-                        else:
-                            highlight_char = "*"
-                    except ValueError:
-                        highlight_char = "*"
-            else:
-                highlight_char = "+"
+            create_time = p.get("create_time")
+            highlight_char = get_rss_marker(pid, create_time, rss_mb, sample_time)
             rss_display = f"{rss_mb_s}{highlight_char}"
-            current_rss_to_save[pid_s] = rss_mb_s
+            if not is_selecting:
+                record_rss_sample(pid, create_time, rss_mb, sample_time)
+            # Growth over the ring buffer (up to RSS_HISTORY_SAMPLES frames);
+            # blank until a process has two samples.
+            rss_rate = None if is_docker_mode else get_rss_growth_rate(pid)
+            rss_rate_s = f"{rss_rate:+.2f}" if rss_rate is not None else ""
             line_attr = current_value_attr
             line_cmd_attr = current_cmd_attr
             line_cpu_attr = line_attr
@@ -1325,6 +1868,10 @@ def draw_process_block_content(
                         win, line_y, x, f"{rss_display:>{col_rss}}", line_rss_attr
                     )
                     x += col_rss + spacing
+                    addstr_clipped(
+                        win, line_y, x, f"{rss_rate_s:>{col_rss_rate}}", line_attr
+                    )
+                    x += col_rss_rate + spacing
                     addstr_clipped(win, line_y, x, f"{vms_mb_s:>{col_vms}}", vms_attr)
                     x += col_vms + spacing
                     addstr_clipped(
@@ -1341,8 +1888,6 @@ def draw_process_block_content(
             except curses.error:
                 pass
             procs_drawn_count += 1
-        if not is_selecting:
-            save_current_rss_state(current_rss_to_save)
     except curses.error:
         pass
     except Exception as e:
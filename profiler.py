@@ -0,0 +1,140 @@
+# profiler.py
+#
+# Frame-time profiler for the monitor. Timings are recorded by name from both
+# the curses loop (drawing, sorting, doupdate) and the sampler thread
+# (collectors, subprocess calls) and kept in a rolling Histogram per name:
+# the last HISTORY_SAMPLES values are mapped to fixed log-spaced buckets, so
+# p50/p95 cost a walk over BUCKET_COUNT counters and memory stays constant
+# however long the monitor runs. Values that arrive many times per frame
+# (cgroup reads of new PIDs) are summed with accumulate() and recorded as one
+# sample when the frame ends.
+
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+HISTORY_SAMPLES = 256
+# Bucket upper bounds in seconds: 10 us * 1.25^i, up to ~30 s
+BUCKET_BOUNDS = tuple(10e-6 * 1.25**i for i in range(68))
+BUCKET_COUNT = len(BUCKET_BOUNDS) + 1  # The last bucket catches everything slower
+
+
+class Histogram:
+    def __init__(self, size=HISTORY_SAMPLES):
+        self.values = [0.0] * size
+        self.buckets = [0] * size
+        self.counts = [0] * BUCKET_COUNT
+        self.next = 0
+        self.filled = 0
+        self.total_count = 0
+        self.total_seconds = 0.0
+
+    def add(self, seconds):
+        size = len(self.values)
+        if self.filled == size:
+            self.counts[self.buckets[self.next]] -= 1
+        else:
+            self.filled += 1
+        bucket = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        self.values[self.next] = seconds
+        self.buckets[self.next] = bucket
+        self.counts[bucket] += 1
+        self.next = (self.next + 1) % size
+        self.total_count += 1
+        self.total_seconds += seconds
+
+    def percentile(self, fraction):
+        """
+        Upper bound of the bucket holding the given fraction of the recent
+        samples (at most 25% above the exact value), capped at the maximum.
+        """
+        if not self.filled:
+            return 0.0
+        rank = max(1, int(round(self.filled * fraction)))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        if bucket < len(BUCKET_BOUNDS):
+            return min(BUCKET_BOUNDS[bucket], self.max())
+        return self.max()
+
+    def max(self):
+        return max(self.values[: self.filled], default=0.0)
+
+    def last(self):
+        return self.values[self.next - 1] if self.filled else 0.0
+
+
+histograms = {}
+pending = {}
+lock = threading.Lock()
+
+
+def record(name, seconds):
+    with lock:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram()
+        histogram.add(seconds)
+
+
+@contextmanager
+def timed(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def accumulate(name, seconds):
+    with lock:
+        pending[name] = pending.get(name, 0.0) + seconds
+
+
+def end_frame():
+    with lock:
+        totals = list(pending.items())
+        pending.clear()
+    for name, seconds in totals:
+        record(name, seconds)
+
+
+def summary():
+    """[(name, last, p50, p95, max, samples)] in seconds, slowest p95 first."""
+    with lock:
+        rows = [
+            (name, h.last(), h.percentile(0.5), h.percentile(0.95), h.max(), h.filled)
+            for name, h in histograms.items()
+        ]
+    rows.sort(key=lambda row: -row[3])
+    return rows
+
+
+def dump(path):
+    """Writes the rolling statistics and bucket counts of every timer as JSON."""
+    with lock:
+        timers = {
+            name: {
+                "samples": h.filled,
+                "total_samples": h.total_count,
+                "total_ms": h.total_seconds * 1000,
+                "last_ms": h.last() * 1000,
+                "p50_ms": h.percentile(0.5) * 1000,
+                "p95_ms": h.percentile(0.95) * 1000,
+                "max_ms": h.max() * 1000,
+                # Recent sample counts keyed by bucket upper bound in ms
+                "buckets": {
+                    (f"{BUCKET_BOUNDS[i] * 1000:.3f}" if i < len(BUCKET_BOUNDS) else "inf"): count
+                    for i, count in enumerate(h.counts)
+                    if count
+                },
+            }
+            for name, h in sorted(histograms.items())
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"written_at": time.time(), "timers": timers}, f, indent=2)
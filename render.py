@@ -0,0 +1,173 @@
+# render.py
+#
+# Damage-tracked drawing for the monitor panels. A RenderWindow stands in for
+# a curses window: it supports the calls the blocks make (getmaxyx, addstr,
+# move, clrtoeol, erase, border) but only records each cell's text and
+# attribute. noutrefresh() compares every row with what the real window
+# already shows and rewrites just the changed span of the changed rows, so a
+# frame in which nothing moved costs no curses calls at all.
+#
+# utils.draw_box draws the border and title once per RenderWindow (windows are
+# recreated on resize) or when the title changes; on other frames it only
+# clears the inside. FrameStats counts the rows and the bytes of text handed
+# to curses per frame.
+
+import curses
+
+
+class FrameStats:
+    def __init__(self):
+        self.frames = 0
+        self.rows = 0
+        self.bytes = 0
+        self.total_rows = 0
+        self.total_bytes = 0
+
+    def begin_frame(self):
+        self.frames += 1
+        self.rows = 0
+        self.bytes = 0
+
+    def add(self, rows, size):
+        self.rows += rows
+        self.bytes += size
+        self.total_rows += rows
+        self.total_bytes += size
+
+
+class RenderWindow:
+    def __init__(self, win, stats=None):
+        self.win = win
+        self.stats = stats or FrameStats()
+        self.height, self.width = win.getmaxyx()
+        self.chars = self._blank_rows()
+        self.attrs = [[0] * self.width for _ in range(self.height)]
+        # What the real window holds: a new curses window starts out blank
+        self.shown_chars = self._blank_rows()
+        self.shown_attrs = [[0] * self.width for _ in range(self.height)]
+        self.cursor = (0, 0)
+        self.box_key = None
+
+    def _blank_rows(self):
+        return [[" "] * self.width for _ in range(self.height)]
+
+    # --- curses window API used by the blocks ---
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def getbegyx(self):
+        return self.win.getbegyx()
+
+    def move(self, y, x):
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error("move() outside the window")
+        self.cursor = (y, x)
+
+    def addstr(self, *args):
+        """addstr(y, x, text[, attr]) or addstr(text[, attr]); text past the right edge is cut off."""
+        if len(args) >= 3:
+            y, x, text = args[:3]
+            attr = args[3] if len(args) > 3 else 0
+            self.move(y, x)
+        else:
+            (y, x), text = self.cursor, args[0]
+            attr = args[1] if len(args) > 1 else 0
+        text = str(text)
+        count = min(len(text), self.width - x)
+        self.chars[y][x : x + count] = text[:count]
+        self.attrs[y][x : x + count] = [attr] * count
+        self.cursor = (y, min(x + count, self.width - 1))
+        if count < len(text):
+            raise curses.error("addstr() past the window edge")
+
+    def clrtoeol(self):
+        y, x = self.cursor
+        self.chars[y][x:] = [" "] * (self.width - x)
+        self.attrs[y][x:] = [0] * (self.width - x)
+
+    def erase(self):
+        self.chars = self._blank_rows()
+        self.attrs = [[0] * self.width for _ in range(self.height)]
+        self.cursor = (0, 0)
+        self.box_key = None
+
+    def border(self):
+        h, w = self.height, self.width
+        if h < 2 or w < 2:
+            return
+        top, bottom = self.chars[0], self.chars[h - 1]
+        top[1 : w - 1] = bottom[1 : w - 1] = [curses.ACS_HLINE] * (w - 2)
+        top[0], top[w - 1] = curses.ACS_ULCORNER, curses.ACS_URCORNER
+        bottom[0], bottom[w - 1] = curses.ACS_LLCORNER, curses.ACS_LRCORNER
+        for y in range(1, h - 1):
+            self.chars[y][0] = self.chars[y][w - 1] = curses.ACS_VLINE
+        for y in (0, h - 1):
+            self.attrs[y][:] = [0] * w
+        for y in range(1, h - 1):
+            self.attrs[y][0] = self.attrs[y][w - 1] = 0
+
+    def clear_interior(self):
+        """Blanks everything inside the border, leaving the border and title rows as drawn."""
+        w = self.width
+        if self.height < 3 or w < 2:
+            return
+        for y in range(1, self.height - 1):
+            self.chars[y] = [curses.ACS_VLINE] + [" "] * (w - 2) + [curses.ACS_VLINE]
+            self.attrs[y] = [0] * w
+        self.cursor = (0, 0)
+
+    def touchwin(self):
+        self.win.touchwin()
+
+    def noutrefresh(self):
+        self.flush()
+        self.win.noutrefresh()
+
+    # --- Damage tracking ---
+
+    def flush(self):
+        """Writes the rows that differ from the real window; returns (rows, bytes) written."""
+        rows = size = 0
+        for y in range(self.height):
+            chars, attrs = self.chars[y], self.attrs[y]
+            shown_chars, shown_attrs = self.shown_chars[y], self.shown_attrs[y]
+            if chars == shown_chars and attrs == shown_attrs:
+                continue
+            start, end = 0, self.width
+            while chars[start] == shown_chars[start] and attrs[start] == shown_attrs[start]:
+                start += 1
+            while chars[end - 1] == shown_chars[end - 1] and attrs[end - 1] == shown_attrs[end - 1]:
+                end -= 1
+            size += self._write_span(y, start, end)
+            rows += 1
+            self.shown_chars[y] = list(chars)
+            self.shown_attrs[y] = list(attrs)
+        self.stats.add(rows, size)
+        return rows, size
+
+    def _write_span(self, y, start, end):
+        chars, attrs = self.chars[y], self.attrs[y]
+        size = 0
+        x = start
+        while x < end:
+            attr = attrs[x]
+            if not isinstance(chars[x], str):  # ACS border character
+                try:
+                    self.win.addch(y, x, chars[x], attr)
+                except curses.error:
+                    pass  # The bottom-right cell moves the cursor off the window
+                size += 1
+                x += 1
+                continue
+            run_end = x + 1
+            while run_end < end and attrs[run_end] == attr and isinstance(chars[run_end], str):
+                run_end += 1
+            text = "".join(chars[x:run_end])
+            try:
+                self.win.addstr(y, x, text, attr)
+            except curses.error:
+                pass
+            size += len(text.encode("utf-8", "replace"))
+            x = run_end
+        return size
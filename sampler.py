@@ -0,0 +1,155 @@
+# sampler.py
+#
+# Runs the data collectors on a background thread so the curses loop only
+# renders and handles input. Each pass builds a fresh Snapshot and swaps it in
+# with a single reference assignment (double buffering): readers always see a
+# complete, immutable snapshot and never wait for collection. The wall time of
+# each collector run is passed to `on_timing`.
+#
+# Collectors are scheduled individually: each has its own interval (the
+# sampler default unless `intervals` names it) and a smoothed observed cost in
+# `costs`. A pass runs only the collectors that are due; the others keep their
+# previous data in the snapshot. A collector whose cost exceeds `max_load` of
+# its interval is stretched to cost / max_load, so one slow source (a hung
+# nvidia-smi, a huge process table) cannot keep the thread busy and starve the
+# cheap ones.
+
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+Snapshot = namedtuple("Snapshot", ["seq", "timestamp", "data", "errors"])
+
+EMPTY_SNAPSHOT = Snapshot(0, 0.0, MappingProxyType({}), MappingProxyType({}))
+
+# Weight of the newest run in the smoothed cost
+COST_SMOOTHING = 0.3
+DEFAULT_MAX_LOAD = 0.5
+
+
+class Sampler(threading.Thread):
+    def __init__(
+        self,
+        collectors,
+        interval,
+        on_timing=None,
+        intervals=None,
+        max_load=DEFAULT_MAX_LOAD,
+    ):
+        super().__init__(name="lim-sampler", daemon=True)
+        self.collectors = list(collectors)
+        self.interval = interval
+        self.on_timing = on_timing
+        self.intervals = {
+            name: (intervals or {}).get(name, interval) for name, _ in self.collectors
+        }
+        self.max_load = max_load
+        self.costs = {}
+        self.next_due = {}
+        self._snapshot = EMPTY_SNAPSHOT
+        self._wake = threading.Event()
+        self._refresh_all = False
+        self._published = threading.Condition()
+        self._stopping = False
+
+    def latest(self):
+        return self._snapshot
+
+    def wait_for_snapshot(self, after_seq=0, timeout=None):
+        with self._published:
+            self._published.wait_for(
+                lambda: self._snapshot.seq > after_seq or self._stopping, timeout
+            )
+        return self._snapshot
+
+    def request_refresh(self):
+        """Runs every collector on the next pass, whether due or not."""
+        self._refresh_all = True
+        self._wake.set()
+
+    def stop(self, timeout=2.0):
+        self._stopping = True
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def effective_interval(self, name):
+        interval = self.intervals[name]
+        cost = self.costs.get(name)
+        if cost and self.max_load:
+            interval = max(interval, cost / self.max_load)
+        return interval
+
+    def due_collectors(self, now):
+        return [
+            name
+            for name, _ in self.collectors
+            if self.next_due.get(name, 0.0) <= now
+        ]
+
+    def sample_once(self, names=None):
+        """Runs the named collectors (all by default) and publishes a snapshot."""
+        previous = self._snapshot
+        data = dict(previous.data)
+        errors = dict(previous.errors)
+        for name, collect in self.collectors:
+            if names is not None and name not in names:
+                continue
+            started = time.perf_counter()
+            try:
+                data[name] = collect()
+                errors.pop(name, None)
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+            cost = time.perf_counter() - started
+            previous_cost = self.costs.get(name)
+            self.costs[name] = (
+                cost
+                if previous_cost is None
+                else previous_cost + COST_SMOOTHING * (cost - previous_cost)
+            )
+            if self.on_timing:
+                self.on_timing(name, cost)
+        snapshot = Snapshot(
+            previous.seq + 1,
+            time.time(),
+            MappingProxyType(data),
+            MappingProxyType(errors),
+        )
+        with self._published:
+            self._snapshot = snapshot
+            self._published.notify_all()
+        return snapshot
+
+    def prime(self, names):
+        """
+        Runs the named collectors on the calling thread before start(), so a
+        first frame can be drawn from them; the thread then begins with the
+        remaining collectors and keeps these on their usual schedule.
+        """
+        started = time.monotonic()
+        snapshot = self.sample_once(names)
+        for name in names:
+            self.next_due[name] = started + self.effective_interval(name)
+        return snapshot
+
+    def run(self):
+        while not self._stopping:
+            started = time.monotonic()
+            if self._refresh_all:
+                self._refresh_all = False
+                names = [name for name, _ in self.collectors]
+            else:
+                names = self.due_collectors(started)
+            if names:
+                self.sample_once(names)
+                for name in names:
+                    self.next_due[name] = started + self.effective_interval(name)
+            if self.next_due:
+                remaining = min(self.next_due.values()) - time.monotonic()
+            else:
+                remaining = self.interval
+            if remaining > 0:
+                self._wake.wait(remaining)
+            self._wake.clear()
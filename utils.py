@@ -5,6 +5,7 @@ import psutil
 import datetime
 import os
 import re
+from itertools import groupby
 
 
 V_GRAPH_CHARS = [" ", " ", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
@@ -21,6 +22,26 @@ format_uptime = lambda s: str(datetime.timedelta(seconds=int(s))) if s else "N/A
 format_bytes = lambda b: psutil._common.bytes2human(b) if b is not None else "0B"
 
 
+class _SanitizeTable(dict):
+    """str.translate table replacing non-printable characters with '?', filled in per code point on first use."""
+
+    def __missing__(self, code):
+        value = code if chr(code).isprintable() else "?"
+        self[code] = value
+        return value
+
+
+SANITIZE_TABLE = _SanitizeTable()
+for _code in range(256):
+    SANITIZE_TABLE[_code]
+del _code
+
+
+def sanitize_text(text):
+    text = str(text)
+    return text if text.isprintable() else text.translate(SANITIZE_TABLE)
+
+
 def addstr_clipped(win, y, x, text, attr=0):
     try:
         if not win:
@@ -31,9 +52,7 @@ def addstr_clipped(win, y, x, text, attr=0):
         available_width = w - x
         if available_width <= 0:
             return
-        display_text = "".join(
-            c if c.isprintable() else "?" for c in str(text)[:available_width]
-        )
+        display_text = sanitize_text(str(text)[:available_width])
         try:
             win.addstr(y, x, display_text, attr)
         except curses.error:
@@ -46,10 +65,66 @@ def addstr_clipped(win, y, x, text, attr=0):
         pass
 
 
+def addstr_runs(win, y, x, runs, max_x=None):
+    """
+    Draws a row given as (text, attr) runs starting at x: adjacent runs with
+    the same attribute are joined and each resulting run is one addstr call.
+    Text is clipped at max_x (the window width by default).
+    """
+    try:
+        if not win:
+            return
+        h, w = win.getmaxyx()
+        if max_x is None or max_x > w:
+            max_x = w
+        if y >= h or y < 0 or x < 0 or x >= max_x:
+            return
+        merged = []
+        for text, attr in runs:
+            if not text:
+                continue
+            if merged and merged[-1][1] == attr:
+                merged[-1][0] += text
+            else:
+                merged.append([text, attr])
+        for text, attr in merged:
+            if x >= max_x:
+                break
+            text = sanitize_text(text[: max_x - x])
+            try:
+                win.addstr(y, x, text, attr)
+            except curses.error:
+                if len(text) > 1:
+                    try:
+                        win.addstr(y, x, text[:-1], attr)
+                    except curses.error:
+                        pass
+            x += len(text)
+    except Exception:
+        pass
+
+
+def cells_to_runs(chars, attrs):
+    """Groups a row of per-cell characters and attributes into (text, attr) runs."""
+    runs = []
+    start = 0
+    for attr, group in groupby(attrs):
+        end = start + sum(1 for _ in group)
+        runs.append(("".join(chars[start:end]), attr))
+        start = end
+    return runs
+
+
 def draw_box(win, title="", title_attr=0):
     try:
         if not win:
             return
+        # A render.RenderWindow keeps the border and title from the last frame
+        # and only needs its inside cleared, until the title changes
+        box_key = (title, title_attr)
+        if getattr(win, "box_key", None) == box_key:
+            win.clear_interior()
+            return
         win.erase()
         win.border()
         h, w = win.getmaxyx()
@@ -58,6 +133,8 @@ def draw_box(win, title="", title_attr=0):
             title_len = len(trimmed_title)
             title_x = max(1, min(w - title_len - 4, (w - (title_len + 2)) // 2))
             addstr_clipped(win, 0, title_x, f" {trimmed_title} ", title_attr)
+        if hasattr(win, "box_key"):
+            win.box_key = box_key
     except curses.error:
         pass
     except Exception:
@@ -88,10 +165,7 @@ def addstr_colored_markup(win, y, start_x, text, default_attr, tag_map):
                 remaining_width_on_line = w - current_x - 1
                 if remaining_width_on_line <= 0:
                     break
-                clipped_part = "".join(
-                    c if c.isprintable() else "?"
-                    for c in part[:remaining_width_on_line]
-                )
+                clipped_part = sanitize_text(part[:remaining_width_on_line])
                 try:
                     win.addstr(clipped_part, current_attr)
                     current_x += len(clipped_part)
@@ -124,6 +198,20 @@ def draw_bar(win, y, x, width, percent, max_width, colors, show_percent=True):
         if width == 0:
             return
 
+    runs = bar_runs(width, percent, colors)
+    if show_percent:
+        percent_str = f"{max(0.0, min(100.0, percent)):.1f}%".rjust(6)
+        if x + 1 + width + 2 + len(percent_str) < w_win:
+            runs += [(" ", curses.A_NORMAL), (percent_str, runs[1][1])]
+    addstr_runs(win, y, x, runs)
+
+
+def bar_runs(width, percent, colors):
+    """
+    (text, attr) runs of a "[###---]" bar with `width` cells inside the
+    brackets; the second run is always the filled part (possibly empty), so
+    callers can reuse its attribute for the percentage.
+    """
     clamped_percent = max(0.0, min(100.0, percent))
     filled_width = max(0, min(width, int(width * clamped_percent / 100)))
 
@@ -133,32 +221,18 @@ def draw_bar(win, y, x, width, percent, max_width, colors, show_percent=True):
     elif clamped_percent > 60:
         bar_color_pair = colors.get("med", 0)
 
-    has_colors = curses.has_colors()
-    if has_colors:
+    if curses.has_colors():
         bar_attr = curses.color_pair(bar_color_pair) | curses.A_BOLD
         empty_attr = curses.color_pair(5) | curses.A_DIM
     else:
         bar_attr = curses.A_REVERSE
         empty_attr = curses.A_NORMAL
 
-    bar_str = "#" * filled_width
-    empty_str = "-" * (width - filled_width)
-    percent_str = f"{clamped_percent:.1f}%".rjust(6) if show_percent else ""
-    try:
-        addstr_clipped(win, y, x, "[", empty_attr)
-        if filled_width > 0:
-            addstr_clipped(win, y, x + 1, bar_str, bar_attr)
-        if width - filled_width > 0:
-            addstr_clipped(win, y, x + 1 + filled_width, empty_str, empty_attr)
-        addstr_clipped(win, y, x + 1 + width, "]", empty_attr)
-        if show_percent:
-            percent_x = x + 1 + width + 2
-            if percent_x + len(percent_str) < w_win:
-                addstr_clipped(win, y, percent_x, percent_str, bar_attr)
-    except curses.error:
-        pass
-    except Exception:
-        pass
+    return [
+        ("[", empty_attr),
+        ("#" * filled_width, bar_attr),
+        ("-" * (width - filled_width) + "]", empty_attr),
+    ]
 
 
 def print_clickable_command(win, y, x, text, attr=0):